@@ -23,3 +23,100 @@ log.addHandler(ch)
 # log.warn('warn message')
 # log.error('error message')
 # log.critical('critical message')
+
+
+# --------------------------------------------------------------------- run ---
+from . import clock, telemetry
+
+def _init(backend, default_clock, framerate, on_demand):
+    """ Prepare the clock and the windows of the backend for the main loop
+    and return the clock """
+
+    if default_clock is None:
+        default_clock = clock.get_default()
+    default_clock.set_fps_limit(framerate)
+
+    # Interrupt waits for events when asynchronous calls complete
+    default_clock.set_wakeup_function(getattr(backend, 'wakeup', None))
+
+    # Initialize timers for all windows
+    for window in backend.windows():
+        window._on_demand = on_demand
+
+        # Start timers
+        window._start_timers(default_clock)
+
+        # Dispatch init event
+        window.dispatch_event('on_init')
+
+    return default_clock
+
+
+def _step(backend, clock, idle=False, poll=False, telemetry=None):
+    """ Run one iteration of the main loop and return the number of windows
+    left, as returned by the backend.
+
+    :Parameters:
+
+        ``idle``: bool
+            Whether to wait in the backend for events or the next scheduled
+            function first
+
+        ``poll``: bool
+            Whether to tick the clock without limiting the framerate
+
+        ``telemetry``: Telemetry
+            Telemetry recording the phases of the iteration, if any
+    """
+
+    if telemetry is not None:
+        telemetry.begin(backend, clock)
+    completed = False
+    try:
+        if idle:
+            backend.wait(clock.get_sleep_time(True))
+        if telemetry is not None:
+            telemetry.ticking()
+        dt = clock.tick(poll=poll)
+        if telemetry is not None:
+            telemetry.processing()
+        count = backend.process(dt)
+        completed = True
+    finally:
+        if telemetry is not None:
+            telemetry.end(completed)
+    return count
+
+
+def run(backend, default_clock=None, framerate=0, on_demand=False):
+    """ Run the main loop until all windows of the backend are closed
+
+    If on_demand is True, windows are only redrawn once they have been
+    invalidated (see window.Window.invalidate).  Whenever no window needs to
+    be redrawn, because of on_demand or because windows have their own frame
+    rate (see window.Window.set_framerate), the loop sleeps in the backend
+    until an event arrives or the next scheduled function of the clock (or
+    window frame) is due.
+
+    When a window to be redrawn has its buffer swaps synchronized with the
+    display (see configuration.Configuration.vsync), the swap already paces
+    the frames and the clock is ticked without sleeping for the framerate.
+
+    Iterations are broken down into phases when telemetry is enabled (see
+    app.telemetry).
+    """
+
+    default_clock = _init(backend, default_clock, framerate, on_demand)
+
+    # Run until no more window
+    count = len(backend.windows())
+    while count:
+        idle, vsync = True, False
+        for window in backend.windows():
+            if window.needs_redraw:
+                idle = False
+                if window._swap_interval:
+                    vsync = True
+                    break
+        count = _step(backend, default_clock, idle, vsync,
+                      telemetry._telemetry)
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2014, Vispy Development Team.
+# Distributed under the (new) BSD License. See LICENSE.txt for more info.
+# -----------------------------------------------------------------------------
+"""
+Main loop driven by an asyncio event loop.
+
+Instead of owning the thread like `app.run`, the main loop can run as
+callbacks of an asyncio event loop, so that windows live alongside asyncio
+code (network clients, servers...) in the same thread::
+
+    from app import aio
+
+    @asyncio.coroutine
+    def fetch(dt, url):
+        data = yield from download(url)
+        ...
+
+    aio.schedule_once(fetch, 1.0, 'http://...')
+    aio.run(backend, framerate=60)
+
+Each iteration of the main loop processes the backend and ticks the clock,
+then is scheduled with `call_at` for the time the clock says the next frame
+or scheduled function is due, so that the event loop is free to run other
+callbacks meanwhile.  Since backends do not expose their event sources to
+asyncio, they are still polled at least every `poll_interval` seconds when
+there is nothing else to do.
+
+Coroutines can be scheduled with the same API as `Clock.schedule_once`.
+"""
+try:
+    import asyncio
+except ImportError:
+    import trollius as asyncio
+from . import clock, telemetry, _init, _step
+
+# Spelled asyncio.async before Python 3.4.4
+_ensure_future = getattr(asyncio, 'ensure_future', None) or \
+                 getattr(asyncio, 'async')
+
+# Runner of the main loop, if running
+_runner = None
+
+
+class _Runner(object):
+    """ Main loop iterations scheduled on an asyncio event loop """
+
+    def __init__(self, backend, clock, poll_interval, loop):
+        self.backend = backend
+        self.clock = clock
+        self.poll_interval = poll_interval
+        self.loop = loop
+        self.done = asyncio.Future(loop=loop)
+        self.done.add_done_callback(self.finish)
+        self.handle = None
+
+    def step(self):
+        self.handle = None
+        try:
+            count = _step(self.backend, self.clock, poll=True,
+                          telemetry=telemetry._telemetry)
+        except BaseException as e:
+            # Stop the main loop and hand the error over to whoever waits
+            # for it, rather than to the exception handler of the event loop
+            if not self.done.done():
+                self.done.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        if not count:
+            if not self.done.done():
+                self.done.set_result(None)
+            return
+
+        idle, vsync = True, False
+        for window in self.backend.windows():
+            if window.needs_redraw:
+                idle = False
+                if window._swap_interval:
+                    vsync = True
+                    break
+        if vsync:
+            # The buffer swap paces the frames
+            delay = 0
+        else:
+            delay = self.clock.get_sleep_time(idle)
+            if delay is None or delay > self.poll_interval:
+                delay = self.poll_interval
+        self.handle = self.loop.call_at(self.loop.time() + delay, self.step)
+
+    def wakeup(self):
+        """ Run the next iteration as soon as possible """
+
+        if self.handle is not None:
+            self.handle.cancel()
+            self.handle = self.loop.call_soon(self.step)
+
+    def threadsafe_wakeup(self):
+        """ Run the next iteration as soon as possible, from any thread """
+
+        self.loop.call_soon_threadsafe(self.wakeup)
+
+    def finish(self, done):
+        """ Detach the runner from the clock once the main loop is over,
+        so that no wakeup reaches a stopped or closed event loop """
+
+        global _runner
+
+        if _runner is self:
+            self.clock.set_wakeup_function(None)
+            _runner = None
+
+
+class _Coroutine(object):
+    """ Scheduled function starting a coroutine as a task.  It compares and
+    hashes equal to the coroutine function so that it can be unscheduled by
+    it. """
+
+    def __init__(self, func, loop):
+        self.func = func
+        self.loop = loop
+
+    def __call__(self, dt, *args, **kwargs):
+        _ensure_future(self.func(dt, *args, **kwargs), loop=self.loop)
+
+    def __eq__(self, other):
+        if isinstance(other, _Coroutine):
+            other = other.func
+        return self.func == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.func)
+
+
+def start(backend, default_clock=None, framerate=0, on_demand=False,
+          poll_interval=0.01, loop=None):
+    """ Start the main loop on an asyncio event loop and return a future
+    done when all windows of the backend are closed.
+
+    The arguments are those of `app.run`, plus `poll_interval`, the maximum
+    time in seconds between two polls of the backend events, and the
+    event loop to use (the current one by default).
+    """
+
+    global _runner
+
+    if loop is None:
+        loop = asyncio.get_event_loop()
+    default_clock = _init(backend, default_clock, framerate, on_demand)
+    _runner = _Runner(backend, default_clock, poll_interval, loop)
+    _runner.handle = loop.call_soon(_runner.step)
+    # Asynchronous calls complete on other threads
+    default_clock.set_wakeup_function(_runner.threadsafe_wakeup)
+    return _runner.done
+
+
+def run(backend, default_clock=None, framerate=0, on_demand=False,
+        poll_interval=0.01, loop=None):
+    """ Run the main loop on an asyncio event loop until all windows of the
+    backend are closed.
+
+    See `start`.
+    """
+
+    if loop is None:
+        loop = asyncio.get_event_loop()
+    loop.run_until_complete(start(backend, default_clock, framerate,
+                                  on_demand, poll_interval, loop))
+
+
+def schedule_once(func, delay, *args, **kwargs):
+    """ Schedule a coroutine function to be run once after delay seconds.
+
+    When the timer lapses, the coroutine returned by calling func with the
+    elapsed time, followed by any args and kwargs, is run as a task of the
+    event loop.  The clock of the running main loop is used, or the default
+    clock if it is not running yet.
+
+    :Parameters:
+
+        ``func``: coroutine function
+            Function returning the coroutine to run
+
+        ``delay``: float
+            Number of seconds to wait before the timer lapses
+
+    :rtype: handle
+    :return: A handle whose ``cancel`` method removes this scheduling
+    """
+
+    if _runner is not None:
+        handle = _runner.clock.schedule_once(
+            _Coroutine(func, _runner.loop), delay, *args, **kwargs)
+        _runner.wakeup()
+    else:
+        handle = clock.schedule_once(
+            _Coroutine(func, asyncio.get_event_loop()), delay, *args, **kwargs)
+    return handle
+
+
+def unschedule(func):
+    """ Remove a coroutine function from the schedule. """
+
+    if _runner is not None:
+        _runner.clock.unschedule(func)
+    else:
+        clock.unschedule(func)
@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2014, Vispy Development Team.
+# Distributed under the (new) BSD License. See LICENSE.txt for more info.
+# -----------------------------------------------------------------------------
+"""
+Registry of the backends.
+
+Backends can be listed and probed for availability and capabilities without
+initializing any toolkit, and are only imported when needed::
+
+    from app import backends
+
+    for name in backends.available():
+        print name, backends.probe(name)['version']
+
+    backend = backends.get('glfw')
+    window = backend.Window()
+    app.run(backend)
+
+`get` returns a lazy proxy: the backend module is imported on first use of
+any of its attributes, and backends initialize their toolkit when their
+first window is created.
+
+Probing a backend does not import it nor its toolkit: the toolkit is only
+looked for (see `pkgutil` and `app.ext.library.find_library`), and the
+capabilities are read from the source of the backend module.  The version
+of the toolkit is only known once the backend has been imported, which also
+tells whether the toolkit actually works.  Probe results are cached on disk
+(see `cache_path`) along with the location and modification time of the
+toolkit, and of the dynamic linker cache for backends using a native
+library, so that what was learned by importing a backend is remembered
+until these change.
+"""
+import os
+import sys
+import ast
+import pkgutil
+from .. ext import cache, library
+
+
+# Backend names and the Python module or native library (None) of their
+# toolkit, in order of preference
+__backends__ = [ ('glfw',    None),
+                 ('sdl2',    'sdl2'),
+                 ('pyside',  'PySide'),
+                 ('pyglet',  'pyglet'),
+                 ('sdl',     'pygame'),
+                 ('osxglut', 'OpenGL'),
+                 ('null',    '') ]
+
+# Native libraries, as loaded by their wrapper in app.ext
+__libraries__ = { 'glfw' : ('glfw', ['glfw', 'glfw3'],
+                            ['libglfw.so.3', 'libglfw.3.dylib', 'glfw3.dll'],
+                            'GLFW_LIBRARY') }
+
+# Platforms backends are restricted to
+__platforms__ = { 'osxglut' : 'darwin' }
+
+# Probe results, by backend name
+__probes__ = {}
+
+# Lazy backends, by name
+__proxies__ = {}
+
+
+# ------------------------------------------------------------------- cache ---
+def cache_path():
+    """ Path of the cache of the probe results.
+
+    It is given by the APP_BACKENDS_CACHE environment variable, if set (an
+    empty value disables the cache), otherwise it is in the user cache
+    directory.
+    """
+
+    return cache.cache_path('APP_BACKENDS_CACHE', 'backends.json')
+
+
+def _load_cache():
+    return cache.load(cache_path(), sys.executable)
+
+
+def _save_cache(probes):
+    cache.save(cache_path(), sys.executable, probes)
+
+
+def _find_module(name):
+    """ Path of a top-level module or package, without importing it, or None
+    if it cannot be found """
+
+    try:
+        from importlib.util import find_spec
+    except ImportError:
+        find_spec = None
+    try:
+        if find_spec is None:
+            loader = pkgutil.find_loader(name)
+            return getattr(loader, 'filename', None)
+        spec = find_spec(name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None:
+        return None
+    if spec.origin and os.path.exists(spec.origin):
+        return spec.origin
+    locations = list(spec.submodule_search_locations or [])
+    return locations[0] if locations else None
+
+
+def _stamp(name, toolkit):
+    """ Return what the probe result of a backend depends on, or None if its
+    toolkit cannot be found. """
+
+    platform = __platforms__.get(name)
+    if platform is not None and not sys.platform.startswith(platform):
+        return None
+    module = os.path.join(os.path.dirname(__file__), 'backend_%s.py' % name)
+    stamp = [os.path.getmtime(module)]
+    if toolkit is None:
+        # Native library, found through the dynamic linker
+        path = library.find_library(*__libraries__[name])
+        if path is None:
+            return None
+        stamp.append(path)
+        try:
+            stamp.append(os.path.getmtime('/etc/ld.so.cache'))
+        except OSError:
+            stamp.append(None)
+    elif toolkit:
+        path = _find_module(toolkit)
+        if path is None:
+            return None
+        stamp.extend([path, os.path.getmtime(path)])
+    return stamp
+
+
+def _capability(name):
+    """ Read the capabilities of a backend from its source """
+
+    module = os.path.join(os.path.dirname(__file__), 'backend_%s.py' % name)
+    with open(module) as f:
+        tree = ast.parse(f.read(), module)
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and \
+           [getattr(target, 'id', None) for target in node.targets] == \
+           ['capability']:
+            return ast.literal_eval(node.value)
+    return None
+
+
+# ------------------------------------------------------------------- probe ---
+def names():
+    """ Names of all the backends, in order of preference. """
+
+    return [name for name, toolkit in __backends__]
+
+
+def probe(name):
+    """ Probe a backend without initializing its toolkit.
+
+    :Parameters:
+
+        ``name``: str
+            Name of the backend
+
+    :rtype: dict
+    :return: A dict with the ``name``, ``availability``, ``version`` and
+        ``capability`` of the backend.  ``version`` and ``capability`` are
+        None if the backend is not available, and ``version`` is also None
+        until the backend has been imported once.
+    """
+
+    result = __probes__.get(name)
+    if result is not None:
+        return result
+
+    toolkit = dict(__backends__)[name]
+    stamp = _stamp(name, toolkit)
+    if stamp is None:
+        result = { 'name'         : name,
+                   'availability' : False,
+                   'version'      : None,
+                   'capability'   : None }
+    else:
+        probes = _load_cache()
+        entry = probes.get(name)
+        if entry is not None and entry.get('stamp') == stamp:
+            result = entry['result']
+        else:
+            # Assume the toolkit found works until the backend is imported
+            result = { 'name'         : name,
+                       'availability' : True,
+                       'version'      : None,
+                       'capability'   : _capability(name) }
+            probes[name] = { 'stamp' : stamp, 'result' : result }
+            _save_cache(probes)
+    __probes__[name] = result
+    return result
+
+
+def _imported(name, module):
+    """ Update the probe result of a backend with what importing it told """
+
+    if module is not None and module.availability:
+        result = { 'name'         : name,
+                   'availability' : True,
+                   'version'      : module.__version__,
+                   'capability'   : dict(module.capability) }
+    else:
+        result = { 'name'         : name,
+                   'availability' : False,
+                   'version'      : None,
+                   'capability'   : None }
+    if __probes__.get(name) == result:
+        return
+    __probes__[name] = result
+    stamp = _stamp(name, dict(__backends__)[name])
+    if stamp is not None:
+        probes = _load_cache()
+        probes[name] = { 'stamp' : stamp, 'result' : result }
+        _save_cache(probes)
+
+
+def available():
+    """ Names of the available backends, in order of preference. """
+
+    return [name for name in names() if probe(name)['availability']]
+
+
+# ---------------------------------------------------------------- backends ---
+def _import(name):
+    module = __name__ + '.backend_' + name
+    __import__(module)
+    return sys.modules[module]
+
+
+class _Backend(object):
+    """ Backend module imported on first use of any of its attributes """
+
+    def __init__(self, name):
+        self.name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        module = self._module
+        if module is None:
+            try:
+                module = _import(self.name)
+            except Exception:
+                _imported(self.name, None)
+                raise
+            _imported(self.name, module)
+            if not module.availability:
+                raise RuntimeError('%s backend is not available' % self.name)
+            self._module = module
+        value = getattr(module, attr)
+        # Functions and classes are never rebound by backends, so they can
+        # be kept to skip this on the next lookups (e.g. by the main loop)
+        if callable(value):
+            self.__dict__[attr] = value
+        return value
+
+    def __repr__(self):
+        return '<lazy backend %s>' % self.name
+
+
+def get(name=None):
+    """ Get a backend, imported on first use.
+
+    :Parameters:
+
+        ``name``: str
+            Name of the backend, or None for the first available one with
+            a display (the null backend must be asked for by name)
+
+    :rtype: backend
+    """
+
+    if name is None:
+        candidates = [other for other in available() if other != 'null']
+        if not candidates:
+            raise RuntimeError('No backend with a display available')
+        name = candidates[0]
+    elif name not in dict(__backends__):
+        raise ValueError('Unknown backend %r' % name)
+    backend = __proxies__.get(name)
+    if backend is None:
+        backend = __proxies__[name] = _Backend(name)
+    return backend
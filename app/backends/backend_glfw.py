@@ -2,7 +2,7 @@
 # Copyright (c) 2014, Vispy Development Team.
 # Distributed under the (new) BSD License. See LICENSE.txt for more info.
 # -----------------------------------------------------------------------------
-import sys
+import sys, time
 from .. window import window
 from .. import log, clock, configuration
 
@@ -41,41 +41,12 @@ try:
     from .. ext import glfw
     availability = True
     __version__ = ("%d.%d.%d") % glfw.version
-    __init__()
 
     __mouse_map__ = { glfw.GLFW_MOUSE_BUTTON_LEFT:   window.mouse.LEFT,
                       glfw.GLFW_MOUSE_BUTTON_MIDDLE: window.mouse.MIDDLE,
                       glfw.GLFW_MOUSE_BUTTON_RIGHT:  window.mouse.RIGHT }
 
-    __key_map__   = { glfw.GLFW_KEY_ESCAPE:        window.key.ESCAPE,
-                      glfw.GLFW_KEY_ENTER:         window.key.ENTER,
-                      glfw.GLFW_KEY_TAB:           window.key.TAB,
-                      glfw.GLFW_KEY_BACKSPACE:     window.key.BACKSPACE,
-                      glfw.GLFW_KEY_INSERT:        window.key.INSERT,
-                      glfw.GLFW_KEY_DELETE:        window.key.DELETE,
-                      glfw.GLFW_KEY_RIGHT:         window.key.RIGHT,
-                      glfw.GLFW_KEY_LEFT:          window.key.LEFT,
-                      glfw.GLFW_KEY_DOWN:          window.key.DOWN,
-                      glfw.GLFW_KEY_UP:            window.key.UP,
-                      glfw.GLFW_KEY_PAGE_UP:       window.key.PAGEUP,
-                      glfw.GLFW_KEY_PAGE_DOWN:     window.key.PAGEDOWN,
-                      glfw.GLFW_KEY_HOME:          window.key.HOME,
-                      glfw.GLFW_KEY_END:           window.key.END,
-                      glfw.GLFW_KEY_CAPS_LOCK:     window.key.CAPSLOCK,
-                      glfw.GLFW_KEY_PRINT_SCREEN:  window.key.PRINT,
-                      glfw.GLFW_KEY_PAUSE:         window.key.PAUSE,
-                      glfw.GLFW_KEY_F1:            window.key.F1,
-                      glfw.GLFW_KEY_F2:            window.key.F2,
-                      glfw.GLFW_KEY_F3:            window.key.F3,
-                      glfw.GLFW_KEY_F4:            window.key.F4,
-                      glfw.GLFW_KEY_F5:            window.key.F5,
-                      glfw.GLFW_KEY_F6:            window.key.F6,
-                      glfw.GLFW_KEY_F7:            window.key.F7,
-                      glfw.GLFW_KEY_F8:            window.key.F8,
-                      glfw.GLFW_KEY_F9:            window.key.F9,
-                      glfw.GLFW_KEY_F10:           window.key.F10,
-                      glfw.GLFW_KEY_F11:           window.key.F11,
-                      glfw.GLFW_KEY_F12:           window.key.F12 }
+    __keys__      = window.key.get_table('glfw', glfw)
 
 except ImportError:
     availability = False
@@ -95,6 +66,7 @@ capability = {
     "Set GL version"          : True,
     "Set GL profile"          : True,
     "Share GL context"        : True,
+    "Vertical sync"           : True,
 }
 
 
@@ -142,6 +114,10 @@ class Window(window.Window):
     def __init__( self, width=256, height=256, title=None, visible=True,
                   decoration=True, fullscreen=False, config=None, context=None):
 
+        # Initialize the toolkit on first window creation
+        if not __initialized__:
+            __init__()
+
         window.Window.__init__(self, width, height, title, visible,
                                decoration, fullscreen, config, context)
 
@@ -162,7 +138,15 @@ class Window(window.Window):
         self._native_window = glfw.glfwCreateWindow( self._width, self._height,
                                                      self._title, None, None)
         glfw.glfwMakeContextCurrent(self._native_window)
-        glfw.glfwSwapInterval(0)
+
+        interval = config.swap_interval
+        if interval < 0 and not (
+            glfw.glfwExtensionSupported("WGL_EXT_swap_control_tear") or
+            glfw.glfwExtensionSupported("GLX_EXT_swap_control_tear")):
+            # No adaptive sync, fall back to regular sync
+            interval = 1
+        glfw.glfwSwapInterval(interval)
+        self._swap_interval = interval
 
         #def on_window_move(window, xpos, ypos):
         #    self._on_window_move(xpos, ypos)
@@ -237,9 +221,7 @@ class Window(window.Window):
         glfw.glfwSetWindowShouldClose(self._native_window, True)
         glfw.glfwDestroyWindow(self._native_window)
         __windows__.remove(self)
-        for i in range(len(self._timer_stack)):
-            handler, interval = self._timer_stack[i]
-            self._clock.unschedule(handler)
+        self._stop_timers()
         self.dispatch_event('on_close')
 
     #def _on_window_iconify(self, iconified ):
@@ -294,22 +276,11 @@ class Window(window.Window):
         self.dispatch_event('on_character', u"%c" % character)
 
     def _modifiers_translate( self, modifiers ):
-        _modifiers = 0
-        if modifiers & glfw.GLFW_MOD_SHIFT:
-            _modifiers |=  window.key.MOD_SHIFT
-        if modifiers & glfw.GLFW_MOD_CONTROL:
-            _modifiers |=  window.key.MOD_CTRL
-        if modifiers & glfw.GLFW_MOD_ALT:
-            _modifiers |=  window.key.MOD_ALT
-        if modifiers & glfw.GLFW_MOD_SUPER:
-            _modifiers |=  window.key.MOD_COMMAND
         self._modifiers = modifiers
-        return _modifiers
+        return __keys__.translate_modifiers(modifiers)
 
     def _keyboard_translate( self, code ):
-        if (32 <= code <= 96) or code in [161,162]:
-            return code
-        return __key_map__.get(code, window.key.UNKNOWN)
+        return __keys__.translate_key(code)
 
 
     def show(self):
@@ -357,6 +328,27 @@ def windows():
     return __windows__
 
 
+# -------------------------------------------------------------------- wait ---
+def wait(timeout=None):
+    """ Wait for events, at most timeout seconds (forever if None) """
+
+    if timeout is None:
+        glfw.glfwWaitEvents()
+    elif hasattr(glfw, 'glfwWaitEventsTimeout'):
+        glfw.glfwWaitEventsTimeout(timeout)
+    else:
+        # GLFW < 3.2 cannot wait with a timeout, we nap instead
+        time.sleep(min(timeout, 0.01))
+
+
+# ------------------------------------------------------------------ wakeup ---
+def wakeup():
+    """ Make the current or next wait return, from any thread """
+
+    if hasattr(glfw, 'glfwPostEmptyEvent'):
+        glfw.glfwPostEmptyEvent()
+
+
 # ----------------------------------------------------------------- process ---
 def process(dt):
 
@@ -364,17 +356,8 @@ def process(dt):
     glfw.glfwPollEvents()
 
     for window in __windows__:
-        # Make window active
-        window.activate()
-
-        # Dispatch the main draw event
-        window.dispatch_event('on_draw')
-
-        # Dispatch the idle event
-        window.dispatch_event('on_idle', dt)
-
-        # Swap buffers
-        window.swap()
-
+        window.flush_events()
+        if window.needs_redraw:
+            window._redraw(dt)
 
     return len(__windows__)
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2014, Vispy Development Team.
+# Distributed under the (new) BSD License. See LICENSE.txt for more info.
+# -----------------------------------------------------------------------------
+"""
+Headless backend.
+
+This backend does not need any toolkit nor display: windows have no native
+counterpart and nothing is ever drawn on screen.  Events come from a
+synthetic source instead, either posted explicitly with
+`Window.post_event` or generated on each iteration of the main loop by a
+function given to `Window.set_event_source`.  It is meant for running the
+main loop, clock pacing and event dispatch on display-less machines, for
+testing or benchmarking::
+
+    window = backend_null.Window()
+
+    @window.event
+    def on_draw():
+        pass
+
+    def source(window, dt):
+        return [('on_mouse_motion', (10, 10, 1, 1))]
+    window.set_event_source(source)
+
+    app.run(backend_null)
+
+Since there is no OpenGL context, draw handlers must not make GL calls.
+Vertical sync is emulated for a display refreshing `refresh_rate` times per
+second, buffer swaps sleeping until the next retrace.
+"""
+import time
+import math
+import threading
+import collections
+from .. window import window
+from .. import log, clock, configuration
+
+
+# Backend name
+__name__ = "Null"
+
+# Backend version (if available)
+__version__ = "0.1"
+
+# Whether the framework has been initialized
+__initialized__ = False
+
+# Active windows
+__windows__ = []
+
+# Default clock
+__clock__ = None
+
+# Set when something happens that a wait without timeout must return for
+__wakeup__ = threading.Event()
+
+
+# --------------------------------------------------------------- init/exit ---
+def __init__():
+    global __initialized__
+    __initialized__ = True
+
+def __exit__():
+    global __initialized__
+    __initialized__ = False
+
+
+# ------------------------------------------------------------ availability ---
+availability = True
+
+
+# -------------------------------------------------------------- capability ---
+capability = {
+    "Window position get/set" : True,
+    "Window size get/set"     : True,
+    "Multiple windows"        : True,
+    "Mouse scroll events"     : True,
+    "Non-decorated window"    : True,
+    "Non-sizeable window"     : True,
+    "Fullscreen mode"         : True,
+    "Unicode processing"      : True,
+    "Set GL version"          : False,
+    "Set GL profile"          : False,
+    "Share GL context"        : False,
+    "Vertical sync"           : True,
+}
+
+
+# ------------------------------------------------------- set_configuration ---
+def set_configuration(config):
+    # There is no GL context to configure
+    pass
+
+
+# ------------------------------------------------------------------ Window ---
+class Window(window.Window):
+
+    #: Refresh rate of the emulated display, used for vertical sync
+    refresh_rate = 60.0
+
+    def __init__( self, width=256, height=256, title=None, visible=True,
+                  decoration=True, fullscreen=False, config=None, context=None):
+
+        # Initialize the toolkit on first window creation
+        if not __initialized__:
+            __init__()
+
+        window.Window.__init__(self, width, height, title, visible,
+                               decoration, fullscreen, config, context)
+
+        if config is None:
+            config = configuration.Configuration()
+        set_configuration(config)
+
+        # Synthetic native event queue and source
+        self._native_events = collections.deque()
+        self._event_source = None
+
+        # Number of buffer swaps, i.e. frames "displayed"
+        self._swap_count = 0
+
+        # Emulated vertical sync and time of the last retrace swapped on
+        self._swap_interval = config.swap_interval
+        self._last_retrace = 0.0
+
+        __windows__.append(self)
+
+
+    def post_event(self, event_type, *args):
+        '''Post a synthetic event.
+
+        The event is dispatched on the next iteration of the main loop, as
+        if it had been received from the windowing system.
+
+        :Parameters:
+
+            ``event_type``: str
+                Name of the event, e.g. 'on_mouse_motion'
+
+            ``args``:
+                Arguments of the event
+        '''
+        assert event_type in self._event_type_set
+        self._native_events.append((event_type, args))
+        __wakeup__.set()
+
+    def set_event_source(self, source):
+        '''Set a function generating synthetic events.
+
+        :Parameters:
+
+            ``source``: callable
+                Function called on each iteration of the main loop with the
+                window and the elapsed time since the last iteration.  It
+                must return an iterable of (event_type, args) pairs, or None
+                to remove itself.
+        '''
+        self._event_source = source
+        __wakeup__.set()
+
+    def _process_events(self, dt):
+        source = self._event_source
+        if source is not None:
+            events = source(self, dt)
+            if events is None:
+                self._event_source = None
+            else:
+                self._native_events.extend(events)
+
+        events = self._native_events
+        while events:
+            event_type, args = events.popleft()
+            if event_type == 'on_resize':
+                self._width, self._height = args
+            elif event_type == 'on_close':
+                self.close()
+                continue
+            elif event_type in ('on_mouse_motion', 'on_mouse_drag'):
+                self._mouse_x, self._mouse_y = args[:2]
+            self.dispatch_event(event_type, *args)
+
+
+    def show(self):
+        self._visible = True
+        self.dispatch_event('on_show')
+
+    def hide(self):
+        self._visible = False
+        self.dispatch_event('on_hide')
+
+    def close(self):
+        if self in __windows__:
+            __windows__.remove(self)
+        self._stop_timers()
+        self.dispatch_event('on_close')
+        __wakeup__.set()
+
+    def set_title(self, title):
+        self._title = title
+
+    def get_title(self):
+        return self._title
+
+    def set_size(self, width, height):
+        self._width, self._height = width, height
+        self.dispatch_event('on_resize', width, height)
+
+    def get_size(self):
+        return self._width, self._height
+
+    def set_position(self, x, y):
+        self._x, self._y = x, y
+
+    def get_position(self):
+        return self._x, self._y
+
+    def swap(self):
+        self._swap_count += 1
+        if not self._swap_interval:
+            return
+        period = 1.0 / self.refresh_rate
+        now = clock._default_time_function()
+        retrace = (math.floor(now / period) + 1) * period
+        late = retrace - self._last_retrace > 1.5 * period
+        if self._swap_interval < 0 and late:
+            # Late frame, adaptive sync swaps right away
+            self._last_retrace = retrace - period
+            return
+        time.sleep(retrace - now)
+        self._last_retrace = retrace
+
+    def activate(self):
+        pass
+
+
+# ----------------------------------------------------------------- windows ---
+def windows():
+    return __windows__
+
+
+# -------------------------------------------------------------------- wait ---
+def wait(timeout=None):
+
+    # Return as soon as a window has something to process, otherwise sleep
+    # until the timeout, or until an event is posted (possibly from another
+    # thread), a window is closed or wakeup is called.
+    for window in __windows__:
+        if window._native_events or window._event_source is not None:
+            return
+    if timeout is None:
+        # Wait in steps, so that the process can still be interrupted
+        while __windows__ and not __wakeup__.wait(1.0):
+            pass
+    elif timeout > 0:
+        __wakeup__.wait(timeout)
+    # Cleared once awake, so that no wakeup is lost
+    __wakeup__.clear()
+
+
+# ------------------------------------------------------------------ wakeup ---
+def wakeup():
+    """ Make the current or next wait return, from any thread """
+
+    __wakeup__.set()
+
+
+# ----------------------------------------------------------------- process ---
+def process(dt):
+
+    # Poll for and process events
+    for window in list(__windows__):
+        window._process_events(dt)
+
+    for window in __windows__:
+        window.flush_events()
+        if window.needs_redraw:
+            window._redraw(dt)
+
+    return len(__windows__)
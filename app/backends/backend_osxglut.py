@@ -2,7 +2,7 @@
 # Copyright (c) 2014, Vispy Development Team.
 # Distributed under the (new) BSD License. See LICENSE.txt for more info.
 # -----------------------------------------------------------------------------
-import sys
+import sys, time
 from .. window import window
 from .. import log, clock, configuration
 
@@ -51,40 +51,13 @@ try:
             __version__ = None
         availability = True
         __version__ = "%d" % glut.GLUT_API_VERSION
-        __init__()
 
         __mouse_map__ = { glut.GLUT_LEFT_BUTTON:   window.mouse.LEFT,
                           glut.GLUT_MIDDLE_BUTTON: window.mouse.MIDDLE,
                           glut.GLUT_RIGHT_BUTTON:  window.mouse.RIGHT }
 
-        __key_map__   = { 0x008:                   window.key.BACKSPACE,
-                          0x009:                   window.key.TAB,
-                          0x00A:                   window.key.LINEFEED,
-                          0x00C:                   window.key.CLEAR,
-                          0x00D:                   window.key.RETURN,
-                          0x018:                   window.key.CANCEL,
-                          0x01B:                   window.key.ESCAPE,
-                          glut.GLUT_KEY_F1:        window.key.F1,
-                          glut.GLUT_KEY_F2:        window.key.F2,
-                          glut.GLUT_KEY_F3:        window.key.F3,
-                          glut.GLUT_KEY_F4:        window.key.F4,
-                          glut.GLUT_KEY_F5:        window.key.F5,
-                          glut.GLUT_KEY_F6:        window.key.F6,
-                          glut.GLUT_KEY_F7:        window.key.F7,
-                          glut.GLUT_KEY_F8:        window.key.F8,
-                          glut.GLUT_KEY_F9:        window.key.F9,
-                          glut.GLUT_KEY_F10:       window.key.F10,
-                          glut.GLUT_KEY_F11:       window.key.F11,
-                          glut.GLUT_KEY_F12:       window.key.F12,
-                          glut.GLUT_KEY_LEFT:      window.key.LEFT,
-                          glut.GLUT_KEY_UP:        window.key.UP,
-                          glut.GLUT_KEY_RIGHT:     window.key.RIGHT,
-                          glut.GLUT_KEY_DOWN:      window.key.DOWN,
-                          glut.GLUT_KEY_PAGE_UP:   window.key.PAGEUP,
-                          glut.GLUT_KEY_PAGE_DOWN: window.key.PAGEDOWN,
-                          glut.GLUT_KEY_HOME:      window.key.HOME,
-                          glut.GLUT_KEY_END:       window.key.END,
-                          glut.GLUT_KEY_INSERT:    window.key.INSERT }
+        __keys__         = window.key.get_table('glut', glut)
+        __special_keys__ = window.key.get_table('glut-special', glut)
     else:
         availability = False
         __version__ = None
@@ -106,6 +79,7 @@ capability = {
     "Set GL version"          : False,
     "Set GL profile"          : False,
     "Share GL context"        : False,
+    "Vertical sync"           : False,
 }
 
 
@@ -132,6 +106,9 @@ def set_configuration(config):
 
     glut.glutInitDisplayString(s)
 
+    if config.vsync:
+        log.warn("OSXGLUT backend cannot synchronize buffer swaps")
+
 
 
 # ------------------------------------------------------------------ Window ---
@@ -140,6 +117,10 @@ class Window(window.Window):
     def __init__( self, width=256, height=256, title=None, visible=True,
                   decoration=True, fullscreen=False, config=None, context=None):
 
+        # Initialize the toolkit on first window creation
+        if not __initialized__:
+            __init__()
+
         if len(__windows__) > 0:
             log.critical(
                 """OSXGLUT backend is unstable with more than one window.\n"""
@@ -199,34 +180,22 @@ class Window(window.Window):
     def _special( self, code, x, y ):
         modifiers = glut.glutGetModifiers()
         self.dispatch_event('on_key_press',
-                            self._keyboard_translate(code),
+                            __special_keys__.translate_key(code),
                             self._modifiers_translate(modifiers))
 
     def _special_up( self, code, x, y ):
         modifiers = glut.glutGetModifiers()
         self.dispatch_event('on_key_release',
-                            self._keyboard_translate(code),
+                            __special_keys__.translate_key(code),
                             self._modifiers_translate(modifiers))
 
 
     def _modifiers_translate( self, modifiers ):
-        _modifiers = 0
-        if modifiers & glut.GLUT_ACTIVE_SHIFT:
-            _modifiers |=  window.key.MOD_SHIFT
-        if modifiers & glut.GLUT_ACTIVE_CTRL:
-            _modifiers |=  window.key.MOD_CTRL
-        if modifiers & glut.GLUT_ACTIVE_ALT:
-            _modifiers |=  window.key.MOD_ALT
-        return _modifiers
+        return __keys__.translate_modifiers(modifiers)
 
 
     def _keyboard_translate( self, code ):
-        ascii = ord(code.lower())
-        if (0x020 <= ascii <= 0x040) or (0x05b <= ascii <= 0x07e):
-            return ascii
-        elif ascii <= 0x020:
-            code = ascii
-        return __key_map__.get(code, window.key.UNKNOWN)
+        return __keys__.translate_key(ord(code.lower()))
 
 
     def _display( self ):
@@ -238,9 +207,7 @@ class Window(window.Window):
         # glut.glutDestroyWindow(self._native_window)
         glut.glutSetWindow(self._native_window)
         glut.glutHideWindow()
-        for i in range(len(self._timer_stack)):
-            handler, interval = self._timer_stack[i]
-            self._clock.unschedule(handler)
+        self._stop_timers()
         self.dispatch_event('on_close')
 
     def _reshape(self, width, height):
@@ -350,6 +317,16 @@ def windows():
     return __windows__
 
 
+# -------------------------------------------------------------------- wait ---
+def wait(timeout=None):
+    """ Wait for events, at most timeout seconds (forever if None) """
+
+    # GLUT cannot wait for events, we nap instead
+    if timeout is None:
+        timeout = 0.01
+    time.sleep(min(timeout, 0.01))
+
+
 # ----------------------------------------------------------------- process ---
 def process(dt):
 
@@ -357,15 +334,8 @@ def process(dt):
     glut.glutCheckLoop()
 
     for window in __windows__:
-        window.activate()
-
-        # Dispatch the main draw event
-        window.dispatch_event('on_draw')
-
-        # Dispatch the idle event
-        window.dispatch_event('on_idle', dt)
-
-        # Swap buffers
-        window.swap()
+        window.flush_events()
+        if window.needs_redraw:
+            window._redraw(dt)
 
     return len(__windows__)
@@ -40,11 +40,10 @@ def __exit__():
 try:
     import pyglet
     availability = True
-    version = pyglet.version
-    __init__()
+    __version__ = pyglet.version
 except ImportError:
     availability = False
-    version = None
+    __version__ = None
 
 
 # -------------------------------------------------------------- capability ---
@@ -60,6 +59,7 @@ capability = {
     "Set GL version"          : False,
     "Set GL profile"          : False,
     "Share GL context"        : True,
+    "Vertical sync"           : True,
 }
 
 
@@ -99,6 +99,10 @@ class Window(window.Window):
     def __init__( self, width=256, height=256, title=None, visible=True,
                   decoration=True, fullscreen=False, config=None, context=None):
 
+        # Initialize the toolkit on first window creation
+        if not __initialized__:
+            __init__()
+
         window.Window.__init__(self, width, height, title, visible,
                                decoration, fullscreen, config, context)
 
@@ -108,7 +112,8 @@ class Window(window.Window):
 
         self._native_window = pyglet.window.Window(
             width=self._width, height=self._height, caption=title,
-            vsync=False, config=__configuration__)
+            vsync=bool(config.vsync), config=__configuration__)
+        self._swap_interval = int(bool(config.vsync))
 
  	def on_mouse_drag(x, y, dx, dy, button, modifiers):
             self.dispatch_event("on_mouse_drag", x, y, dx ,dy, button)
@@ -153,9 +158,7 @@ class Window(window.Window):
  	def on_close():
             self._native_window.close()
             __windows__.remove(self)
-            for i in range(len(self._timer_stack)):
-                handler, interval = self._timer_stack[i]
-                self._clock.unschedule(handler)
+            self._stop_timers()
             self.dispatch_event("on_close")
         self._native_window.on_close = on_close
 
@@ -221,6 +224,20 @@ def windows():
     return __windows__
 
 
+# -------------------------------------------------------------------- wait ---
+def wait(timeout=None):
+    """ Wait for events, at most timeout seconds (forever if None) """
+
+    pyglet.app.platform_event_loop.step(timeout)
+
+
+# ------------------------------------------------------------------ wakeup ---
+def wakeup():
+    """ Make the current or next wait return, from any thread """
+
+    pyglet.app.platform_event_loop.notify()
+
+
 # ----------------------------------------------------------------- process ---
 def process(dt):
 
@@ -232,13 +249,9 @@ def process(dt):
         # Dispatch any pending event
         window._native_window.dispatch_events()
 
-        # Dispatch the main draw event
-        window.dispatch_event('on_draw')
-
-        # Dispatch the idle event
-        window.dispatch_event('on_idle', dt)
-
-        # Swap buffers
-        window.swap()
+    for window in __windows__:
+        window.flush_events()
+        if window.needs_redraw:
+            window._redraw(dt)
 
     return len(__windows__)
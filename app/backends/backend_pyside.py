@@ -25,6 +25,9 @@ __clock__ = None
 # GL Format
 __glformat__ = None
 
+# Timer waking up the event loop at the end of a wait
+__timer__ = None
+
 
 # --------------------------------------------------------------- init/exit ---
 def __init__():
@@ -42,8 +45,6 @@ def __exit__():
 # ------------------------------------------------------------ availability ---
 try:
     from PySide import QtGui, QtCore, QtOpenGL
-    if not __initialized__:
-        __init__()
     availability = True
     __version__ = QtCore.__version__
 
@@ -51,34 +52,7 @@ try:
                       1: window.mouse.MIDDLE,
                       2: window.mouse.RIGHT }
 
-    __key_map__ = { QtCore.Qt.Key_Left:      window.key.LEFT,
-                    QtCore.Qt.Key_Up:        window.key.UP,
-                    QtCore.Qt.Key_Right:     window.key.RIGHT,
-                    QtCore.Qt.Key_Down:      window.key.DOWN,
-                    QtCore.Qt.Key_PageUp:    window.key.PAGEUP,
-                    QtCore.Qt.Key_PageDown:  window.key.PAGEDOWN,
-                    QtCore.Qt.Key_Insert:    window.key.INSERT,
-                    QtCore.Qt.Key_Delete:    window.key.DELETE,
-                    QtCore.Qt.Key_Home:      window.key.HOME,
-                    QtCore.Qt.Key_End:       window.key.END,
-                    QtCore.Qt.Key_Escape:    window.key.ESCAPE,
-                    QtCore.Qt.Key_Backspace: window.key.BACKSPACE,
-                    QtCore.Qt.Key_F1:        window.key.F1,
-                    QtCore.Qt.Key_F2:        window.key.F2,
-                    QtCore.Qt.Key_F3:        window.key.F3,
-                    QtCore.Qt.Key_F4:        window.key.F4,
-                    QtCore.Qt.Key_F5:        window.key.F5,
-                    QtCore.Qt.Key_F6:        window.key.F6,
-                    QtCore.Qt.Key_F7:        window.key.F7,
-                    QtCore.Qt.Key_F8:        window.key.F8,
-                    QtCore.Qt.Key_F9:        window.key.F9,
-                    QtCore.Qt.Key_F10:       window.key.F10,
-                    QtCore.Qt.Key_F11:       window.key.F11,
-                    QtCore.Qt.Key_F12:       window.key.F12,
-                    QtCore.Qt.Key_Space:     window.key.SPACE,
-                    QtCore.Qt.Key_Enter:     window.key.ENTER,
-                    QtCore.Qt.Key_Return:    window.key.ENTER,
-                    QtCore.Qt.Key_Tab:       window.key.TAB }
+    __keys__ = window.key.get_table('qt', QtCore)
 
 
 except ImportError:
@@ -99,6 +73,7 @@ capability = {
     "Set GL version"          : True,
     "Set GL profile"          : True,
     "Share GL context"        : True,
+    "Vertical sync"           : True,
 }
 
 
@@ -107,7 +82,8 @@ def set_configuration(config):
     global __glformat__
 
     __glformat__ = QtOpenGL.QGLFormat()
-    __glformat__.setSwapInterval(0)
+    # Qt has no adaptive sync
+    __glformat__.setSwapInterval(abs(config.swap_interval))
     __glformat__.setRedBufferSize(config.red_size)
     __glformat__.setGreenBufferSize(config.green_size)
     __glformat__.setBlueBufferSize(config.blue_size)
@@ -153,12 +129,17 @@ class Window(window.Window):
     def __init__( self, width=256, height=256, title=None, visible=True,
                   decoration=True, fullscreen=False, config=None, context=None):
 
+        # Initialize the toolkit on first window creation
+        if not __initialized__:
+            __init__()
+
         window.Window.__init__(self, width, height, title, visible,
                                decoration, fullscreen, config, context)
 
         if config is None:
             config = configuration.Configuration()
         set_configuration(config)
+        self._swap_interval = abs(config.swap_interval)
 
         self._native_app = QtGui.QApplication.instance()
         if self._native_app is None:
@@ -182,9 +163,7 @@ class Window(window.Window):
 
         def close_event(event):
             __windows__.remove(self)
-            for i in range(len(self._timer_stack)):
-                handler, interval = self._timer_stack[i]
-                self._clock.unschedule(handler)
+            self._stop_timers()
             self.dispatch_event("on_close")
         self._native_window.closeEvent = close_event
 
@@ -250,35 +229,10 @@ class Window(window.Window):
         __windows__.append(self)
 
     def _keyboard_translate( self, code ):
-        if code in __key_map__:
-            return __key_map__[code]
-        if 32 <= code <= 96 or code in [161,162]:
-            return code
-        return window.key.UNKNOWN
-
-    def _modifiers_translate( self, modifiers ):
-        _modifiers = 0
-        if QtCore.Qt.ShiftModifier & modifiers:
-            _modifiers |= window.key.SHIFT,
-        if QtCore.Qt.ControlModifier & modifiers:
-            _modifiers += window.key.CONTROL,
-        if QtCore.Qt.AltModifier & modifiers:
-            _modifiers += window.key.ALT,
-        if QtCore.Qt.MetaModifier & modifiers:
-            _modifiers += window.key.META,
-        return _modifiers
+        return __keys__.translate_key(code)
 
     def _modifiers_translate( self, modifiers ):
-        _modifiers = 0
-        if QtCore.Qt.ShiftModifier & modifiers:
-            _modifiers |= window.key.SHIFT,
-        if QtCore.Qt.ControlModifier & modifiers:
-            _modifiers += window.key.CONTROL,
-        if QtCore.Qt.AltModifier & modifiers:
-            _modifiers += window.key.ALT,
-        if QtCore.Qt.MetaModifier & modifiers:
-            _modifiers += window.key.META,
-        return _modifiers
+        return __keys__.translate_modifiers(int(modifiers))
 
     def show(self):
         self._native_window.show()
@@ -328,6 +282,36 @@ def windows():
     return __windows__
 
 
+# -------------------------------------------------------------------- wait ---
+def wait(timeout=None):
+    """ Wait for events, at most timeout seconds (forever if None) """
+
+    global __timer__
+
+    app = QtGui.QApplication.instance()
+    if timeout is None:
+        app.processEvents(QtCore.QEventLoop.WaitForMoreEvents)
+        return
+
+    # Wake up the event loop when timeout is over, reusing the same timer
+    # and stopping it if an event came first so that timers do not pile up
+    if __timer__ is None:
+        __timer__ = QtCore.QTimer()
+        __timer__.setSingleShot(True)
+    __timer__.start(int(timeout * 1000))
+    app.processEvents(QtCore.QEventLoop.WaitForMoreEvents)
+    __timer__.stop()
+
+
+# ------------------------------------------------------------------ wakeup ---
+def wakeup():
+    """ Make the current or next wait return, from any thread """
+
+    # Posting an event is thread-safe, and the application ignores it
+    QtCore.QCoreApplication.postEvent(QtGui.QApplication.instance(),
+                                      QtCore.QEvent(QtCore.QEvent.User))
+
+
 # ----------------------------------------------------------------- process ---
 def process(dt):
 
@@ -337,17 +321,8 @@ def process(dt):
         # window._native_app.flush()
 
     for window in __windows__:
-        # Make window active
-        window.activate()
-
-        # Dispatch the main draw event
-        window.dispatch_event('on_draw')
-
-        # Dispatch the idle event
-        window.dispatch_event('on_idle', dt)
-
-        # Swap buffers
-        window.swap()
-
+        window.flush_events()
+        if window.needs_redraw:
+            window._redraw(dt)
 
     return len(__windows__)
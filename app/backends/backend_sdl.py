@@ -44,8 +44,6 @@ def __exit__():
 # ------------------------------------------------------------ availability ---
 try:
     import pygame
-    if not __initialized__:
-        __init__()
     availability = True
     __version__ = ("%d.%d.%d") % pygame.version.vernum
 
@@ -53,34 +51,7 @@ try:
                       1:                  window.mouse.MIDDLE,
                       2:                  window.mouse.RIGHT }
 
-    __key_map__   = { 0x008:              window.key.BACKSPACE,
-                      0x009:              window.key.TAB,
-                      0x00A:              window.key.LINEFEED,
-                      0x00C:              window.key.CLEAR,
-                      0x00D:              window.key.RETURN,
-                      0x018:              window.key.CANCEL,
-                      0x01B:              window.key.ESCAPE,
-                      pygame.K_F1:        window.key.F1,
-                      pygame.K_F2:        window.key.F2,
-                      pygame.K_F3:        window.key.F3,
-                      pygame.K_F4:        window.key.F4,
-                      pygame.K_F5:        window.key.F5,
-                      pygame.K_F6:        window.key.F6,
-                      pygame.K_F7:        window.key.F7,
-                      pygame.K_F8:        window.key.F8,
-                      pygame.K_F9:        window.key.F9,
-                      pygame.K_F10:       window.key.F10,
-                      pygame.K_F11:       window.key.F11,
-                      pygame.K_F12:       window.key.F12,
-                      pygame.K_LEFT:      window.key.LEFT,
-                      pygame.K_UP:        window.key.UP,
-                      pygame.K_RIGHT:     window.key.RIGHT,
-                      pygame.K_DOWN:      window.key.DOWN,
-                      pygame.K_PAGEUP:    window.key.PAGEUP,
-                      pygame.K_PAGEDOWN:  window.key.PAGEDOWN,
-                      pygame.K_HOME:      window.key.HOME,
-                      pygame.K_END:       window.key.END,
-                      pygame.K_INSERT:    window.key.INSERT }
+    __keys__      = window.key.get_table('pygame', pygame)
 
 
 except ImportError:
@@ -101,6 +72,7 @@ capability = {
     "Set GL version"          : False,
     "Set GL profile"          : False,
     "Share GL context"        : False,
+    "Vertical sync"           : True,
 }
 
 
@@ -109,7 +81,9 @@ def set_configuration(configuration):
     """ Set gl configuration """
 
     global __flags__
-    pygame.display.gl_set_attribute( pygame.GL_SWAP_CONTROL, 0 )
+    # SDL 1.2 has no adaptive sync
+    pygame.display.gl_set_attribute( pygame.GL_SWAP_CONTROL,
+                                     abs(configuration.swap_interval) )
     pygame.display.gl_set_attribute( pygame.GL_RED_SIZE, configuration.red_size)
     pygame.display.gl_set_attribute( pygame.GL_GREEN_SIZE, configuration.green_size)
     pygame.display.gl_set_attribute( pygame.GL_BLUE_SIZE, configuration.blue_size)
@@ -137,6 +111,10 @@ class Window(window.Window):
     def __init__( self, width=256, height=256, title=None, visible=True,
                   decoration=True, fullscreen=False, config=None, context=None):
 
+        # Initialize the toolkit on first window creation
+        if not __initialized__:
+            __init__()
+
         if len(__windows__) > 0:
             log.critical(
                 """SDL backend cannot have more than one window.\n"""
@@ -155,6 +133,7 @@ class Window(window.Window):
             flags = __flags__ | pygame.NOFRAME
 
         pygame.display.set_mode((width, height), flags)
+        self._swap_interval = abs(config.swap_interval)
         pygame.display.set_caption(self._title)
         __windows__.append(self)
 
@@ -198,34 +177,22 @@ class Window(window.Window):
             button = __mouse_map__.get(event.button, window.mouse.UNKNOWN)
             self.dispatch_event("on_mouse_release", x, y, button)
 
-        elif event.type == pygame.KEYUP:
+        elif event.type == pygame.KEYDOWN:
             modifiers = self._modifiers_translate(event.mod)
             symbol = self._keyboard_translate(event.key)
             self.dispatch_event("on_key_press", symbol, modifiers)
 
-        elif event.type == pygame.KEYDOWN:
+        elif event.type == pygame.KEYUP:
             modifiers = self._modifiers_translate(event.mod)
             symbol = self._keyboard_translate(event.key)
             self.dispatch_event("on_key_release", symbol, modifiers)
 
 
     def _modifiers_translate( self, modifiers ):
-        _modifiers = 0
-        if modifiers & (pygame.K_LSHIFT | pygame.K_RSHIFT):
-            _modifiers |=  window.key.MOD_SHIFT
-        if modifiers & (pygame.K_LCTRL | pygame.K_RCTRL):
-            _modifiers |=  window.key.MOD_CTRL
-        if modifiers & (pygame.K_LALT | pygame.K_RALT):
-            _modifiers |=  window.key.MOD_ALT
-        return _modifiers
+        return __keys__.translate_modifiers(modifiers)
 
     def _keyboard_translate(self, code):
-        ascii = code
-        if (0x020 <= ascii <= 0x040) or (0x05b <= ascii <= 0x07e):
-            return ascii
-        elif ascii <= 0x020:
-            code = ascii
-        return __key_map__.get(code, window.key.UNKNOWN)
+        return __keys__.translate_key(code)
 
     def close(self):
         __windows__.remove(self)
@@ -243,6 +210,27 @@ def windows():
     return __windows__
 
 
+# -------------------------------------------------------------------- wait ---
+def wait(timeout=None):
+    """ Wait for events, at most timeout seconds (forever if None) """
+
+    if timeout is None:
+        # Nap rather than wait, leaving events queued in order for process
+        while not pygame.event.peek():
+            pygame.time.wait(10)
+    elif not pygame.event.peek():
+        # pygame cannot wait for events with a timeout, we nap instead
+        pygame.time.wait(int(min(timeout, 0.01) * 1000))
+
+
+# ------------------------------------------------------------------ wakeup ---
+def wakeup():
+    """ Make the current or next wait return, from any thread """
+
+    # User events are ignored by process
+    pygame.event.post(pygame.event.Event(pygame.USEREVENT))
+
+
 # ----------------------------------------------------------------- process ---
 def process(dt):
 
@@ -255,16 +243,8 @@ def process(dt):
     for event in pygame.event.get():
         window.process_event(event)
 
-    # Activate window
-    window.activate()
-
-    # Dispatch the main draw event
-    window.dispatch_event('on_draw')
-
-    # Dispatch the idle event
-    window.dispatch_event('on_idle', dt)
-
-    # Swap buffers
-    window.swap()
+    window.flush_events()
+    if window.needs_redraw:
+        window._redraw(dt)
 
     return 1
@@ -38,8 +38,6 @@ def __exit__():
 # ------------------------------------------------------------ availability ---
 try:
     import sdl2
-    if not __initialized__:
-        __init__()
     availability = True
     __version__ = ("%d.%d.%d") % sdl2.version_info[:3]
 except ImportError:
@@ -60,6 +58,7 @@ capability = {
     "Set GL version"          : True,
     "Set GL profile"          : True,
     "Share GL context"        : True,
+    "Vertical sync"           : True,
 }
 
 
@@ -105,6 +104,10 @@ class Window(window.Window):
                   decoration=True, fullscreen=False, config=None, context=None):
         """ """
 
+        # Initialize the toolkit on first window creation
+        if not __initialized__:
+            __init__()
+
         window.Window.__init__(self, width, height, title, visible,
                                decoration, fullscreen, config, context)
         if config is None:
@@ -129,140 +132,99 @@ class Window(window.Window):
         self._native_context = sdl2.SDL_GL_CreateContext(self._native_window)
         self._native_id = sdl2.SDL_GetWindowID(self._native_window)
 
-        sdl2.SDL_GL_SetSwapInterval(0)
+        interval = config.swap_interval
+        if interval < 0 and sdl2.SDL_GL_SetSwapInterval(interval) < 0:
+            # No adaptive sync, fall back to regular sync
+            interval = 1
+        if interval >= 0 and sdl2.SDL_GL_SetSwapInterval(interval) < 0:
+            interval = 0
+        self._swap_interval = interval
 
         __windows__[self._native_id] = self
 
 
     def process_event(self, event):
+        handler = __handlers__.get(event.type)
+        if handler is not None:
+            handler(self, event)
 
+    def _on_window_event(self, event):
+        handler = __window_handlers__.get(event.window.event)
+        if handler is not None:
+            handler(self, event)
 
-        if event.type == sdl2.SDL_WINDOWEVENT:
-
-            if event.window.event == sdl2.SDL_WINDOWEVENT_RESIZED:
-                width = event.window.data1
-                height = event.window.data2
-                self.dispatch_event('on_resize', width, height)
-            elif event.window.event == sdl2.SDL_WINDOWEVENT_SHOWN:
-                self.dispatch_event('on_show')
-            elif event.window.event == sdl2.SDL_WINDOWEVENT_HIDDEN:
-                self.dispatch_event('on_hide')
-            elif event.window.event == sdl2.SDL_WINDOWEVENT_ENTER:
-                self.dispatch_event('on_enter')
-            elif event.window.event == sdl2.SDL_WINDOWEVENT_LEAVE:
-                self.dispatch_event('on_leave')
-            #elif event.window.event == sdl2.SDL_WINDOWEVENT_MOVED:
-            #    self.dispatch_event('on_move')
-            elif event.window.event == sdl2.SDL_WINDOWEVENT_CLOSE:
-                self.close()
-
-        elif event.type == sdl2.SDL_QUIT:
-            self.close()
-
-        elif event.type == sdl2.SDL_MOUSEMOTION:
-            x = event.motion.x
-            y = event.motion.y
-            buttons = event.motion.state
-            dx = x - self._mouse_x
-            dy = y - self._mouse_y
-            self._mouse_x = x
-            self._mouse_y = y
-            if buttons & sdl2.SDL_BUTTON_LMASK:
-                self.dispatch_event("on_mouse_drag", x, y, dx, dy, window.mouse.LEFT)
-            elif buttons & sdl2.SDL_BUTTON_MMASK:
-                self.dispatch_event("on_mouse_drag", x, y, dx, dy, window.mouse.MIDDLE)
-            elif buttons & sdl2.SDL_BUTTON_RMASK:
-                self.dispatch_event("on_mouse_drag", x, y, dx, dy, window.mouse.RIGHT)
-            else:
-                self.dispatch_event("on_mouse_motion", x, y, dx, dy)
-
-        elif event.type == sdl2.SDL_MOUSEBUTTONDOWN:
-            x = event.button.x
-            y = event.button.y
-            button = event.button.button
-            self._mouse_x = x
-            self._mouse_y = y
-            if button == sdl2.SDL_BUTTON_LEFT:
-                self.dispatch_event("on_mouse_press", x, y, window.mouse.LEFT)
-            elif button == sdl2.SDL_BUTTON_MIDDLE:
-                self.dispatch_event("on_mouse_press", x, y, window.mouse.MIDDLE)
-            elif button == sdl2.SDL_BUTTON_RIGHT:
-                self.dispatch_event("on_mouse_press", x, y, window.mouse.RIGHT)
-
-        elif event.type == sdl2.SDL_MOUSEBUTTONUP:
-            x = event.button.x
-            y = event.button.y
-            button = event.button.button
-            self._mouse_x = x
-            self._mouse_y = y
-            if button == sdl2.SDL_BUTTON_LEFT:
-                self.dispatch_event("on_mouse_release", x, y, window.mouse.LEFT)
-            elif button == sdl2.SDL_BUTTON_MIDDLE:
-                self.dispatch_event("on_mouse_release", x, y, window.mouse.MIDDLE)
-            elif button == sdl2.SDL_BUTTON_RIGHT:
-                self.dispatch_event("on_mouse_release", x, y, window.mouse.RIGHT)
-
-        elif event.type == sdl2.SDL_MOUSEWHEEL:
-            offset_x = event.wheel.x
-            offset_y = event.wheel.y
-            self.dispatch_event("on_mouse_scroll",
-                                self._mouse_x, self._mouse_y, offset_x, offset_y)
-
-
-        # elif event.type == pygame.KEYUP:
-        #     modifiers = self._modifiers_translate(event.mod)
-        #     symbol = self._keyboard_translate(event.key)
-        #     self._on_key_press(symbol, modifiers)
-
-        # elif event.type == pygame.KEYDOWN:
-        #     modifiers = self._modifiers_translate(event.mod)
-        #     symbol = self._keyboard_translate(event.key)
-        #     self._on_key_release(symbol, modifiers)
+    def _on_window_resized(self, event):
+        self.dispatch_event('on_resize', event.window.data1, event.window.data2)
+
+    def _on_window_shown(self, event):
+        self.dispatch_event('on_show')
 
+    def _on_window_hidden(self, event):
+        self.dispatch_event('on_hide')
+
+    def _on_window_enter(self, event):
+        self.dispatch_event('on_enter')
+
+    def _on_window_leave(self, event):
+        self.dispatch_event('on_leave')
+
+    def _on_window_close(self, event):
+        self.close()
+
+    def _on_mouse_motion(self, event):
+        x = event.motion.x
+        y = event.motion.y
+        buttons = event.motion.state
+        dx = x - self._mouse_x
+        dy = y - self._mouse_y
+        self._mouse_x = x
+        self._mouse_y = y
+        if buttons & sdl2.SDL_BUTTON_LMASK:
+            self.dispatch_event("on_mouse_drag", x, y, dx, dy, window.mouse.LEFT)
+        elif buttons & sdl2.SDL_BUTTON_MMASK:
+            self.dispatch_event("on_mouse_drag", x, y, dx, dy, window.mouse.MIDDLE)
+        elif buttons & sdl2.SDL_BUTTON_RMASK:
+            self.dispatch_event("on_mouse_drag", x, y, dx, dy, window.mouse.RIGHT)
+        else:
+            self.dispatch_event("on_mouse_motion", x, y, dx, dy)
+
+    def _on_mouse_button_down(self, event):
+        x = event.button.x
+        y = event.button.y
+        self._mouse_x = x
+        self._mouse_y = y
+        button = __buttons__.get(event.button.button)
+        if button is not None:
+            self.dispatch_event("on_mouse_press", x, y, button)
+
+    def _on_mouse_button_up(self, event):
+        x = event.button.x
+        y = event.button.y
+        self._mouse_x = x
+        self._mouse_y = y
+        button = __buttons__.get(event.button.button)
+        if button is not None:
+            self.dispatch_event("on_mouse_release", x, y, button)
+
+    def _on_mouse_wheel(self, event):
+        self.dispatch_event("on_mouse_scroll", self._mouse_x, self._mouse_y,
+                            event.wheel.x, event.wheel.y)
+
+    def _on_key_down(self, event):
+        self.dispatch_event("on_key_press",
+                            self._keyboard_translate(event.key.keysym.sym),
+                            self._modifiers_translate(event.key.keysym.mod))
+
+    def _on_key_up(self, event):
+        self.dispatch_event("on_key_release",
+                            self._keyboard_translate(event.key.keysym.sym),
+                            self._modifiers_translate(event.key.keysym.mod))
 
     def _modifiers_translate( self, modifiers ):
-        _modifiers = 0
-        if modifiers & (pygame.K_LSHIFT | pygame.K_RSHIFT):
-            _modifiers |=  window.key.MOD_SHIFT
-        if modifiers & (pygame.K_LCTRL | pygame.K_RCTRL):
-            _modifiers |=  window.key.MOD_CTRL
-        if modifiers & (pygame.K_LALT | pygame.K_RALT):
-            _modifiers |=  window.key.MOD_ALT
-        return _modifiers
+        return __keys__.translate_modifiers(modifiers)
 
     def _keyboard_translate(self, code):
-        ascii = code
-        if (0x020 <= ascii <= 0x040) or (0x05b <= ascii <= 0x07e):
-            return ascii
-        elif ascii < 0x020:
-            if   ascii == 0x008: return window.key.BACKSPACE
-            elif ascii == 0x009: return window.key.TAB
-            elif ascii == 0x00A: return window.key.LINEFEED
-            elif ascii == 0x00C: return window.key.CLEAR
-            elif ascii == 0x00D: return window.key.RETURN
-            elif ascii == 0x018: return window.key.CANCEL
-            elif ascii == 0x01B: return window.key.ESCAPE
-        elif code==pygame.K_F1:       return window.key.F1
-        elif code==pygame.K_F2:       return window.key.F2
-        elif code==pygame.K_F3:       return window.key.F3
-        elif code==pygame.K_F4:       return window.key.F4
-        elif code==pygame.K_F5:       return window.key.F5
-        elif code==pygame.K_F6:       return window.key.F6
-        elif code==pygame.K_F7:       return window.key.F7
-        elif code==pygame.K_F8:       return window.key.F8
-        elif code==pygame.K_F9:       return window.key.F9
-        elif code==pygame.K_F10:      return window.key.F10
-        elif code==pygame.K_F11:      return window.key.F11
-        elif code==pygame.K_F12:      return window.key.F12
-        elif code==pygame.K_LEFT:     return window.key.LEFT
-        elif code==pygame.K_UP:       return window.key.UP
-        elif code==pygame.K_RIGHT:    return window.key.RIGHT
-        elif code==pygame.K_DOWN:     return window.key.DOWN
-        elif code==pygame.K_PAGE_UP:  return window.key.PAGEUP
-        elif code==pygame.K_PAGE_DOWN:return window.key.PAGEDOWN
-        elif code==pygame.K_HOME:     return window.key.HOME
-        elif code==pygame.K_END:      return window.key.END
-        elif code==pygame.K_INSERT:   return window.key.INSERT
+        return __keys__.translate_key(code)
 
 
     def show(self):
@@ -276,9 +238,7 @@ class Window(window.Window):
     def close(self):
 
         del __windows__[self._native_id]
-        for i in range(len(self._timer_stack)):
-            handler, interval = self._timer_stack[i]
-            self._clock.unschedule(handler)
+        self._stop_timers()
         sdl2.SDL_DestroyWindow(self._native_window)
         self.dispatch_event('on_close')
 
@@ -314,33 +274,106 @@ class Window(window.Window):
 
 
 
+# ---------------------------------------------------------- event dispatch ---
+if availability:
+
+    # Window methods handling each event type
+    __handlers__ = {
+        sdl2.SDL_WINDOWEVENT      : Window._on_window_event,
+        sdl2.SDL_MOUSEMOTION      : Window._on_mouse_motion,
+        sdl2.SDL_MOUSEBUTTONDOWN  : Window._on_mouse_button_down,
+        sdl2.SDL_MOUSEBUTTONUP    : Window._on_mouse_button_up,
+        sdl2.SDL_MOUSEWHEEL       : Window._on_mouse_wheel,
+        sdl2.SDL_KEYDOWN          : Window._on_key_down,
+        sdl2.SDL_KEYUP            : Window._on_key_up }
+
+    # Window methods handling each window event
+    __window_handlers__ = {
+        sdl2.SDL_WINDOWEVENT_RESIZED : Window._on_window_resized,
+        sdl2.SDL_WINDOWEVENT_SHOWN   : Window._on_window_shown,
+        sdl2.SDL_WINDOWEVENT_HIDDEN  : Window._on_window_hidden,
+        sdl2.SDL_WINDOWEVENT_ENTER   : Window._on_window_enter,
+        sdl2.SDL_WINDOWEVENT_LEAVE   : Window._on_window_leave,
+        sdl2.SDL_WINDOWEVENT_CLOSE   : Window._on_window_close }
+
+    __buttons__ = { sdl2.SDL_BUTTON_LEFT   : window.mouse.LEFT,
+                    sdl2.SDL_BUTTON_MIDDLE : window.mouse.MIDDLE,
+                    sdl2.SDL_BUTTON_RIGHT  : window.mouse.RIGHT }
+
+    __keys__ = window.key.get_table('sdl2', sdl2)
+
+    # Preallocated buffer events are fetched into
+    __events__ = (sdl2.SDL_Event * 256)()
+
+# Number of native events handled by the last call to process
+__event_count__ = 0
+
+
 # ----------------------------------------------------------------- windows ---
 def windows():
     return __windows__.values()
 
 
-# ----------------------------------------------------------------- process ---
-def process(dt):
+# -------------------------------------------------------------------- wait ---
+def wait(timeout=None):
+    """ Wait for events, at most timeout seconds (forever if None) """
+
+    # Events are left in the queue for process to handle them
+    if timeout is None:
+        sdl2.SDL_WaitEvent(None)
+    else:
+        sdl2.SDL_WaitEventTimeout(None, int(timeout * 1000))
 
-    # Poll for and process events
+
+# ------------------------------------------------------------------ wakeup ---
+def wakeup():
+    """ Make the current or next wait return, from any thread """
+
+    # User events are ignored by process
     event = sdl2.SDL_Event()
-    while sdl2.SDL_PollEvent(ctypes.byref(event)) != 0:
-        win_id = event.window.windowID
-        if win_id in __windows__.keys():
-            win = __windows__[win_id]
-            win.process_event(event)
+    event.type = sdl2.SDL_USEREVENT
+    sdl2.SDL_PushEvent(ctypes.byref(event))
+
+
+# ----------------------------------------------------------------- process ---
+def process(dt):
+    global __event_count__
+
+    # Fetch events in bulk and route them by type and window
+    events = __events__
+    handlers = __handlers__
+    count = 0
+    sdl2.SDL_PumpEvents()
+    while True:
+        n = sdl2.SDL_PeepEvents(events, len(events), sdl2.SDL_GETEVENT,
+                                sdl2.SDL_FIRSTEVENT, sdl2.SDL_LASTEVENT)
+        for i in range(n):
+            event = events[i]
+            handler = handlers.get(event.type)
+            if handler is not None:
+                # All window related events have their window id at the
+                # same place
+                win = __windows__.get(event.window.windowID)
+                if win is not None:
+                    handler(win, event)
+            elif event.type == sdl2.SDL_QUIT:
+                for win in list(__windows__.values()):
+                    win.close()
+        count += max(n, 0)
+        if n < len(events):
+            break
+    __event_count__ = count
 
     for window in windows():
-        # Make window active
-        window.activate()
+        window.flush_events()
+        if window.needs_redraw:
+            window._redraw(dt)
 
-        # Dispatch the main draw event
-        window.dispatch_event('on_draw')
+    return len(__windows__)
 
-        # Dispatch the idle event
-        window.dispatch_event('on_idle', dt)
 
-        # Swap buffers
-        window.swap()
+# ------------------------------------------------------------- event count ---
+def event_count():
+    """ Number of native events handled by the last call to process """
 
-    return len(__windows__.values())
+    return __event_count__
@@ -38,7 +38,7 @@ try:
     import ToolKit # Replace with actual toolkit
     availability = True
     __version__ = ""
-    __key_map__   = { }
+    __keys__      = None # window.key.get_table('toolkit', ToolKit)
     __mouse_map__ = { }
 
 except ImportError:
@@ -59,6 +59,7 @@ capability = {
     "Set GL version"          : False,
     "Set GL profile"          : False,
     "Share GL context"        : False,
+    "Vertical sync"           : False,
 }
 
 
@@ -78,6 +79,10 @@ class Window(event.EventDispatcher):
                   visible=True, decoration=True, fullscreen=False,
                   sizeable=True, config=None, context=None):
 
+        # Initialize the toolkit on first window creation
+        if not __initialized__:
+            __init__()
+
         # Create the native window here
         # Each on the events below must be called at some point
         pass
@@ -162,6 +167,25 @@ def windows():
     return __windows__
 
 
+# -------------------------------------------------------------------- wait ---
+def wait(timeout=None):
+
+    # Block until events are available or timeout seconds have passed
+    # (forever if timeout is None)
+    # -> Add toolkit specific code here to wait for events
+    pass
+
+
+# ------------------------------------------------------------------ wakeup ---
+def wakeup():
+    """ Make the current or next wait return, from any thread """
+
+    # Must be thread-safe; backends whose wait naps rather than blocking
+    # can leave it out
+    # -> Add toolkit specific code here to post an empty event
+    pass
+
+
 # ----------------------------------------------------------------- process ---
 def process(dt):
 
@@ -170,16 +194,8 @@ def process(dt):
     # -> Must always exit
 
     for window in __windows__:
-        # Make window active
-        window.activate()
-
-        # Dispatch the main draw event
-        window.dispatch_event('on_draw')
-
-        # Dispatch the idle event
-        window.dispatch_event('on_idle', dt)
-
-        # Swap buffers
-        window.swap()
+        window.flush_events()
+        if window.needs_redraw:
+            window._redraw(dt)
 
     return len(__windows__)
@@ -51,7 +51,12 @@ last "tick".
 
 The `get_fps` function averages the framerate over a sliding window of
 approximately 1 second.  (You can calculate the instantaneous framerate by
-taking the reciprocal of ``dt``).
+taking the reciprocal of ``dt``).  The `get_frame_stats` function gives
+percentiles, extremes, jitter and a histogram of the frame durations over
+the same window::
+
+    stats = clock.get_frame_stats()
+    print 'p99 frame time is %f' % stats['p99']
 
 Always remember to `tick` the clock!
 
@@ -67,7 +72,11 @@ number of ticks (frames) per second below 60.
 
 The implementation uses platform-dependent high-resolution sleep functions to
 achieve better accuracy with busy-waiting than would not be possible using just
-the `time` module.
+the `time` module.  On Linux, the clock can instead sleep until an absolute
+deadline and only busy-wait for a fraction of a millisecond, which saves most
+of the CPU spent waiting::
+
+    clock.get_default().set_sleep_strategy(clock.Clock.SLEEP_PRECISE)
 
 Scheduling
 ==========
@@ -102,6 +111,40 @@ You can cancel a function scheduled with any of these methods using
 
     clock.unschedule(animate)
 
+Each of the `schedule` methods also returns a handle which cancels only that
+particular scheduling of the function::
+
+    handle = clock.schedule_interval(animate, .5, velocity=5.0, sprite=alien)
+    handle.cancel()
+
+Functions scheduled with the same interval at the same time are kept
+together and called one after the other.  For large numbers of timers, a
+batch function can instead be scheduled for many ids with
+`schedule_interval_batch`; it is called once per tick with the ids that are
+due::
+
+    def update(ids, dts):
+        positions[ids] += velocities[ids] * dts
+
+    for id in range(10000):
+        clock.schedule_interval_batch(update, .5, id)
+
+Functions doing blocking work can be run by an executor instead, their
+results being passed back to a callback on the thread ticking the clock::
+
+    from concurrent.futures import ThreadPoolExecutor
+    pool = ThreadPoolExecutor(4)
+    clock.schedule_interval_async(poll_files, 1.0, pool, on_files_polled)
+
+To find out which scheduled functions take the most time, profiling can be
+enabled on a clock and the time taken by each function retrieved later::
+
+    clk = clock.get_default()
+    clk.set_profiling(True)
+    # ...
+    for row in clk.get_profile():
+        print row['func'], row['count'], row['mean'], row['max']
+
 Displaying FPS
 ==============
 
@@ -144,7 +187,18 @@ __version__ = '$Id$'
 
 import time
 import sys
-import ctypes, ctypes.util
+import array
+import bisect
+import heapq
+import itertools
+import collections
+import ctypes
+from .ext.library import load_library
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 if sys.platform in ('win32', 'cygwin'):
     # Win32 Sleep function is only 10-millisecond resolution, so instead
@@ -161,35 +215,323 @@ if sys.platform in ('win32', 'cygwin'):
                 0, ctypes.c_void_p(), ctypes.c_void_p(), False)
             _kernel32.WaitForSingleObject(self._timer, 0xffffffff)
 
-    _default_time_function = time.clock
+    _precise_sleep = False
+
+    if hasattr(time, 'perf_counter_ns'):
+        _default_time_ns_function = time.perf_counter_ns
+    else:
+        def _default_time_ns_function():
+            return int(time.clock() * 1000000000)
 
 else:
-    _c_file = ctypes.util.find_library('c')
-    _c = ctypes.CDLL(_c_file)
+    _c = load_library('c', sonames=['libc.so.6', 'libc.dylib'])
     _c.usleep.argtypes = [ctypes.c_ulong]
     class _ClockBase(object):
         def sleep(self, microseconds):
             _c.usleep(int(microseconds))
 
-    _default_time_function = time.time
+    # On Linux, sleep until an absolute time of the monotonic clock, which
+    # unlike relative sleeps does not drift with the time spent in Python.
+    class _timespec(ctypes.Structure):
+        _fields_ = [('tv_sec', ctypes.c_long),
+                    ('tv_nsec', ctypes.c_long)]
+
+    _CLOCK_MONOTONIC = 1
+    _TIMER_ABSTIME = 1
+    _precise_sleep = False
+    if sys.platform.startswith('linux'):
+        try:
+            _c.clock_gettime.argtypes = [ctypes.c_int,
+                                         ctypes.POINTER(_timespec)]
+            _c.clock_nanosleep.argtypes = [ctypes.c_int, ctypes.c_int,
+                                           ctypes.POINTER(_timespec),
+                                           ctypes.POINTER(_timespec)]
+            _precise_sleep = True
+        except AttributeError:
+            pass
+
+    def _monotonic_ns():
+        ts = _timespec()
+        _c.clock_gettime(_CLOCK_MONOTONIC, ctypes.byref(ts))
+        return ts.tv_sec * 1000000000 + ts.tv_nsec
+
+    def _sleep_until_ns(deadline):
+        ts = _timespec(deadline // 1000000000, deadline % 1000000000)
+        # Restart when interrupted by a signal (EINTR)
+        while _c.clock_nanosleep(_CLOCK_MONOTONIC, _TIMER_ABSTIME,
+                                 ctypes.byref(ts), None) == 4:
+            pass
+
+    if hasattr(time, 'monotonic_ns'):
+        _default_time_ns_function = time.monotonic_ns
+    elif _precise_sleep:
+        _default_time_ns_function = _monotonic_ns
+    else:
+        def _default_time_ns_function():
+            return int(time.time() * 1000000000)
+
+def _default_time_function():
+    '''Return the time of the default (monotonic) time source, in seconds.'''
+    return _default_time_ns_function() / 1e9
+
+def _interval_ns(interval):
+    '''Convert an interval in seconds to nanoseconds, keeping positive
+    intervals from rounding down to 0 (which means firing only once).'''
+    if interval <= 0:
+        return 0
+    return max(int(round(interval * 1e9)), 1)
 
 class _ScheduledItem(object):
-    __slots__ = ['func', 'args', 'kwargs']
-    def __init__(self, func, args, kwargs):
+    __slots__ = ['func', 'args', 'kwargs', 'clock']
+    def __init__(self, func, args, kwargs, clock=None):
         self.func = func
         self.args = args
         self.kwargs = kwargs
+        self.clock = clock
 
-class _ScheduledIntervalItem(object):
-    __slots__ = ['func', 'interval', 'last_ts', 'next_ts', 
-                 'args', 'kwargs']
-    def __init__(self, func, interval, last_ts, next_ts, args, kwargs):
-        self.func = func
+    def cancel(self):
+        '''Remove this item from the schedule of its clock.
+
+        Unlike `Clock.unschedule`, only this particular scheduling of the
+        function is cancelled.  No error is raised if the item already
+        fired or was cancelled.
+        '''
+        if self.func is not _dummy_schedule_func:
+            self.clock._cancel_item(self)
+
+class _ScheduledIntervalItem(_ScheduledItem):
+    __slots__ = ['bucket']
+    def __init__(self, func, args, kwargs, clock=None):
+        _ScheduledItem.__init__(self, func, args, kwargs, clock)
+        self.bucket = None
+
+    # Timing is held by the bucket of the item in nanoseconds, and given in
+    # seconds; None once the item has been unscheduled or has fired for the
+    # last time.
+
+    @property
+    def interval(self):
+        if self.bucket is not None:
+            return self.bucket.interval / 1e9
+
+    @property
+    def last_ts(self):
+        if self.bucket is not None:
+            return self.bucket.last_ns / 1e9
+
+    @property
+    def next_ts(self):
+        if self.bucket is not None:
+            return self.bucket.next_ns / 1e9
+
+class _ScheduledBucket(object):
+    '''Interval items sharing the same interval and timing, which are called
+    one after the other and rescheduled together.  Items of a batch function
+    are kept in buckets of their own.
+    '''
+    __slots__ = ['interval', 'last_ns', 'next_ns', 'batch', 'items', 'live',
+                 'key']
+    def __init__(self, interval, last_ns, next_ns, batch=None):
         self.interval = interval
-        self.last_ts = last_ts
-        self.next_ts = next_ts
-        self.args = args
-        self.kwargs = kwargs
+        self.last_ns = last_ns
+        self.next_ns = next_ns
+        self.batch = batch
+        self.items = []
+        # Number of items still scheduled
+        self.live = 0
+        # Key in the clock buckets while waiting in the heap, else None
+        self.key = None
+
+    def add(self, items):
+        for item in items:
+            item.bucket = self
+            self.items.append(item)
+        self.live += len(items)
+
+    def split(self, index):
+        '''Move items from index onwards to a new bucket with the same
+        timing, and return it.'''
+        bucket = _ScheduledBucket(
+            self.interval, self.last_ns, self.next_ns, self.batch)
+        bucket.add([item for item in self.items[index:] if item.bucket is self])
+        del self.items[index:]
+        self.live -= bucket.live
+        return bucket
+
+class _AsyncCall(object):
+    '''Scheduled function submitting another function to an executor, whose
+    futures are queued for completion on the thread ticking the clock.
+
+    It compares and hashes equal to the submitted function, so that
+    unscheduling the function also unschedules its asynchronous calls.
+    '''
+    __slots__ = ['func', 'executor', 'callback', 'clock', 'future']
+    def __init__(self, func, executor, callback, clock):
+        self.func = func
+        self.executor = executor
+        self.callback = callback
+        self.clock = clock
+        self.future = None
+
+    def __call__(self, dt, *args, **kwargs):
+        # Skip this call if the previous one is still running
+        if self.future is not None and not self.future.done():
+            return
+        self.future = self.executor.submit(self.func, dt, *args, **kwargs)
+        self.future.add_done_callback(self.done)
+
+    def done(self, future):
+        # Called from a worker thread; appending to a deque is thread-safe
+        self.clock._completions.append((self.callback, future))
+        wakeup = self.clock._wakeup
+        if wakeup is not None:
+            wakeup()
+
+    def __eq__(self, other):
+        if isinstance(other, _AsyncCall):
+            other = other.func
+        return self.func == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.func)
+
+    def __repr__(self):
+        return '<async %r>' % (self.func,)
+
+class FrameTimes(object):
+    '''Fixed-size ring buffer of frame durations.
+
+    Durations are kept in a preallocated array, and the running sum, sum of
+    squares, histogram and a sorted copy of the window are updated as
+    durations are added and evicted, so that summary statistics, including
+    percentiles, can be polled cheaply.
+    '''
+
+    #: Upper bounds in seconds of the histogram bins; the last bin counts
+    #: all the durations above the last bound.
+    HISTOGRAM_BINS = (0.002, 0.004, 0.008, 0.012, 0.017, 0.025, 0.034,
+                      0.050, 0.100, 0.250)
+
+    def __init__(self, size):
+        '''Create an empty ring buffer.
+
+        :Parameters:
+            `size` : int
+                Number of most recent durations to keep.
+        '''
+        self.size = max(int(size), 1)
+        self.values = array.array('d', [0.0]) * self.size
+        self.clear()
+
+    def clear(self):
+        '''Forget all durations.'''
+        self.count = 0
+        self.index = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.histogram = [0] * (len(self.HISTOGRAM_BINS) + 1)
+        self.sorted = []
+
+    def add(self, value):
+        '''Add a duration, evicting the oldest one if the buffer is full.'''
+        values, index = self.values, self.index
+        if self.count == self.size:
+            old = values[index]
+            self.total -= old
+            self.total_squares -= old * old
+            self.histogram[bisect.bisect_left(self.HISTOGRAM_BINS, old)] -= 1
+            del self.sorted[bisect.bisect_left(self.sorted, old)]
+        else:
+            self.count += 1
+        values[index] = value
+        self.total += value
+        self.total_squares += value * value
+        self.histogram[bisect.bisect_left(self.HISTOGRAM_BINS, value)] += 1
+        bisect.insort(self.sorted, value)
+        index += 1
+        if index == self.size:
+            index = 0
+            # Get rid of the rounding errors accumulated by the running sums
+            self.total = sum(values)
+            self.total_squares = sum([v * v for v in values])
+        self.index = index
+
+    def resize(self, size):
+        '''Change the size of the buffer, keeping the most recent durations.'''
+        size = max(int(size), 1)
+        if size == self.size:
+            return
+        recent = self.recent()
+        self.size = size
+        self.values = array.array('d', [0.0]) * size
+        self.clear()
+        for value in recent[-size:]:
+            self.add(value)
+
+    def recent(self):
+        '''Return the durations in the buffer, oldest first.
+
+        :rtype: list of float
+        '''
+        if self.count < self.size:
+            return self.values[:self.count].tolist()
+        return (self.values[self.index:] + self.values[:self.index]).tolist()
+
+    def __len__(self):
+        return self.count
+
+    def mean(self):
+        '''Return the mean duration, or 0 if the buffer is empty.'''
+        if not self.count:
+            return 0.
+        return self.total / self.count
+
+    def jitter(self):
+        '''Return the standard deviation of the durations.'''
+        if not self.count:
+            return 0.
+        mean = self.total / self.count
+        return max(self.total_squares / self.count - mean * mean, 0.) ** 0.5
+
+    def percentiles(self, *percents):
+        '''Return the durations at the given percentiles (nearest rank).
+
+        :Parameters:
+            `percents` : float
+                Percentiles between 0 and 100.
+
+        :rtype: list of float
+        '''
+        if not self.count:
+            return [0.] * len(percents)
+        values = self.sorted
+        last = self.count - 1
+        return [values[min(max(int(round(p / 100. * last)), 0), last)]
+                for p in percents]
+
+    def get_stats(self):
+        '''Return a summary of the durations in the buffer.
+
+        :rtype: dict
+        :return: A dictionary with the ``count``, ``mean``, ``min``, ``max``,
+            ``p50``, ``p95``, ``p99`` and ``jitter`` of the durations in
+            seconds, and a ``histogram`` list of ``(upper bound, count)``
+            pairs (the last bound being ``None``).
+        '''
+        minimum, p50, p95, p99, maximum = self.percentiles(0, 50, 95, 99, 100)
+        bounds = list(self.HISTOGRAM_BINS) + [None]
+        return { 'count'     : self.count,
+                 'mean'      : self.mean(),
+                 'min'       : minimum,
+                 'max'       : maximum,
+                 'p50'       : p50,
+                 'p95'       : p95,
+                 'p99'       : p99,
+                 'jitter'    : self.jitter(),
+                 'histogram' : list(zip(bounds, self.histogram)) }
 
 def _dummy_schedule_func(*args, **kwargs):
     '''Dummy function that does nothing, placed onto zombie scheduled items
@@ -214,15 +556,80 @@ class Clock(_ClockBase):
     #: to compensate for lazy operating systems.
     SLEEP_UNDERSHOOT = MIN_SLEEP - 0.001
 
+    #: Sleep strategy sleeping down to `MIN_SLEEP` and busy-waiting the rest.
+    SLEEP_BUSY = 'busy'
+
+    #: Sleep strategy sleeping until an absolute deadline, ending early by an
+    #: undershoot learned from the measured oversleep, and busy-waiting only
+    #: for that undershoot.  Only available on Linux.
+    SLEEP_PRECISE = 'precise'
+
+    # Current sleep strategy, see `set_sleep_strategy`.
+    sleep_strategy = SLEEP_BUSY
+
+    # Timestamps (_next_ns, _last_ns and those of the scheduled items) and
+    # intervals are kept in integer nanoseconds, so that they do not drift
+    # however long the clock runs.  They are only converted to seconds when
+    # passed to callbacks or returned to the caller, e.g. by the `next_ts`
+    # and `last_ts` properties.
+
+    # Undershoot learned by the precise sleep strategy, in seconds.
+    _precise_undershoot = 0.0005
+
+    # Total time spent sleeping and busy-waiting while limiting framerate.
+    _sleep_total = 0.
+    _busy_total = 0.
+
     # List of functions to call every tick.
     _schedule_items = None
 
-    # List of schedule interval items kept in sort order.
+    # Number of unscheduled items still sitting in the every-tick list.
+    _schedule_items_dead = 0
+
+    # Sets of the scheduled items of both kinds, indexed by function.
+    _schedule_functions = None
+
+    # Scheduled items whose function is unhashable, found by a linear scan.
+    _schedule_unhashable = None
+
+    # Binary heap of (next_ts, sequence, bucket) entries for schedule
+    # interval items, grouped in buckets of items due at the same time with
+    # the same interval.  Buckets whose items were all unscheduled are left
+    # in place and discarded when they reach the top of the heap.
     _schedule_interval_items = None
 
+    # Buckets in the heap indexed by (next_ts, interval, last_ts, batch), so
+    # that items with the same timing share a bucket.
+    _schedule_buckets = None
+
+    # Number of dead buckets still sitting in the heap.
+    _schedule_interval_dead = 0
+
+    # Buckets popped off the heap and being called by the current tick.
+    _schedule_interval_due = ()
+
+    # Sorted list of the next_ts of live buckets in the heap, used to find
+    # free slots for soft interval items.  None when it needs to be rebuilt.
+    _soft_index = None
+
     # If True, a sleep(0) is inserted on every tick.   
     _force_sleep = False
 
+    # Time budget for scheduled functions on each tick in nanoseconds, or
+    # None if there is none; see `set_time_budget`.
+    _budget_ns = None
+
+    # Number of times each function was deferred or overran the time budget.
+    _budget_stats = None
+
+    # Call count, total time, max time and last overrun of each scheduled
+    # function in nanoseconds, or None if profiling is disabled.
+    _profile = None
+
+    # Function waking up the main loop when asynchronous calls complete, or
+    # None; see `set_wakeup_function`.
+    _wakeup = None
+
     def __init__(self, fps_limit=None, time_function=_default_time_function):
         '''Initialise a Clock, with optional framerate limit and custom
         time function.
@@ -233,22 +640,70 @@ class Clock(_ClockBase):
                 to None.  Deprecated in pyglet 1.2.
             `time_function` : function
                 Function to return the elapsed time of the application, 
-                in seconds.  Defaults to time.time, but can be replaced
-                to allow for easy time dilation effects or game pausing.
+                in seconds.  Defaults to a monotonic high-resolution
+                source, but can be replaced to allow for easy time dilation
+                effects or game pausing.
 
         '''
 
         super(Clock, self).__init__()
         self.time = time_function
-        self.next_ts = self.time()
-        self.last_ts = None
-        self.times = []
+        if time_function is _default_time_function:
+            self._time_ns = _default_time_ns_function
+        else:
+            self._time_ns = lambda: int(round(time_function() * 1e9))
+        self._next_ns = self._time_ns()
+        self._last_ns = None
+        self.frame_times = FrameTimes(60)
 
         self.set_fps_limit(fps_limit)
-        self.cumulative_time = 0
 
         self._schedule_items = []
+        self._schedule_items_dead = 0
+        self._schedule_functions = {}
+        self._schedule_unhashable = []
         self._schedule_interval_items = []
+        self._schedule_buckets = {}
+        self._schedule_interval_dead = 0
+        self._schedule_sequence = itertools.count()
+        self._soft_index = None
+        self._completions = collections.deque()
+
+    @property
+    def next_ts(self):
+        '''Time in seconds the next frame is due, when limiting
+        framerate.'''
+        return self._next_ns / 1e9
+
+    @next_ts.setter
+    def next_ts(self, ts):
+        self._next_ns = int(round(ts * 1e9))
+
+    @property
+    def last_ts(self):
+        '''Time in seconds of the last tick, or None before the first
+        one.'''
+        if self._last_ns is None:
+            return None
+        return self._last_ns / 1e9
+
+    @last_ts.setter
+    def last_ts(self, ts):
+        if ts is None:
+            self._last_ns = None
+        else:
+            self._last_ns = int(round(ts * 1e9))
+
+    @property
+    def times(self):
+        '''Durations of the recent frames in seconds, most recent first
+        (read-only).'''
+        return self.frame_times.recent()[::-1]
+
+    @property
+    def cumulative_time(self):
+        '''Total duration of the recent frames in seconds (read-only).'''
+        return self.frame_times.total
 
     def update_time(self):
         '''Get the elapsed time since the last call to `update_time`.
@@ -262,16 +717,13 @@ class Clock(_ClockBase):
         :return: The number of seconds since the last `update_time`, or 0
             if this was the first time it was called.
         '''
-        ts = self.time()
-        if self.last_ts is None: 
+        ts = self._time_ns()
+        if self._last_ns is None: 
             delta_t = 0
         else:
-            delta_t = ts - self.last_ts
-            self.times.insert(0, delta_t)
-            if len(self.times) > self.window_size:
-                self.cumulative_time -= self.times.pop()
-        self.cumulative_time += delta_t
-        self.last_ts = ts
+            delta_t = (ts - self._last_ns) / 1e9
+            self.frame_times.add(delta_t)
+        self._last_ns = ts
 
         return delta_t
 
@@ -289,55 +741,319 @@ class Clock(_ClockBase):
         :rtype: bool
         :return: True if any functions were called, otherwise False.
         '''
-        ts = self.last_ts
+        ts = self._last_ns
         result = False
+        budget = self._budget_ns
+        if budget is not None:
+            deadline = _default_time_ns_function() + budget
+            fired = False
+        profile = self._profile
+        timed = budget is not None or profile is not None
+
+        # Deliver the results of asynchronous calls
+        if self._completions:
+            result = True
+            self._complete_async_calls()
 
         # Call functions scheduled for every frame  
+        if self._schedule_items_dead:
+            self._schedule_items = \
+                [item for item in self._schedule_items \
+                      if item.func is not _dummy_schedule_func]
+            self._schedule_items_dead = 0
         # Dupe list just in case one of the items unchedules itself
-        for item in list(self._schedule_items):
-            result = True
-            item.func(dt, *item.args, **item.kwargs)
+        if profile is None:
+            for item in list(self._schedule_items):
+                result = True
+                item.func(dt, *item.args, **item.kwargs)
+        else:
+            for item in list(self._schedule_items):
+                result = True
+                func = item.func
+                start = _default_time_ns_function()
+                func(dt, *item.args, **item.kwargs)
+                self._profile_call(
+                    func, _default_time_ns_function() - start, 0)
 
         # Call all scheduled interval functions and reschedule for future.
-        need_resort = False
-        # Dupe list just in case one of the items unchedules itself
-        for item in list(self._schedule_interval_items):
-            if item.next_ts > ts:
-                break
-            result = True
-            item.func(ts - item.last_ts, *item.args, **item.kwargs)
-            if item.interval:
-                # Try to keep timing regular, even if overslept this time;
-                # but don't schedule in the past (which could lead to
-                # infinitely-worsing error).
-                item.next_ts = item.last_ts + item.interval
-                item.last_ts = ts
-                if item.next_ts <= ts:
-                    if ts - item.next_ts < 0.05:
-                        # Only missed by a little bit, keep the same schedule
-                        item.next_ts = ts + item.interval
-                    else:
-                        # Missed by heaps, do a soft reschedule to avoid 
-                        # lumping everything together.
-                        item.next_ts = self._get_soft_next_ts(ts, item.interval)
-                        # Fake last_ts to avoid repeatedly over-scheduling in
-                        # future.  Unfortunately means the next reported dt is
-                        # incorrect (looks like interval but actually isn't).
-                        item.last_ts = item.next_ts - item.interval
-                need_resort = True
+        # Due buckets are all popped before any of them is called, so that
+        # an item scheduled from within a callback waits for the next tick.
+        heap = self._schedule_interval_items
+        due = self._schedule_interval_due = []
+        while heap and heap[0][0] <= ts:
+            bucket = heapq.heappop(heap)[2]
+            if not bucket.live:
+                self._schedule_interval_dead -= 1
             else:
-                item.next_ts = None
+                del self._schedule_buckets[bucket.key]
+                bucket.key = None
+                due.append(bucket)
+        due.reverse()
+        if due and self._soft_index is not None:
+            # The index holds the next_ts of the live buckets in the heap,
+            # those just popped being the lowest ones
+            del self._soft_index[:len(due)]
+
+        batches = None
+        try:
+            while due:
+                bucket = due[-1]
+                # Unscheduled by a previous callback
+                if not bucket.live:
+                    due.pop()
+                    continue
+                result = True
+                dt = (ts - bucket.last_ns) / 1e9
+                items = bucket.items
+                if bucket.batch is not None:
+                    # Gathered and called once all buckets are done
+                    if batches is None:
+                        batches = {}
+                    ids, dts = batches.setdefault(bucket.batch, ([], []))
+                    for item in items:
+                        if item.bucket is bucket:
+                            ids.append(item.args[0])
+                    dts.extend([dt] * (len(ids) - len(dts)))
+                else:
+                    called = 0
+                    try:
+                        if not timed:
+                            for item in items:
+                                item.func(dt, *item.args, **item.kwargs)
+                                called += 1
+                        else:
+                            late = ts - bucket.next_ns
+                            for item in items:
+                                if item.bucket is not bucket:
+                                    # Cancelled by a previous callback
+                                    called += 1
+                                    continue
+                                start = _default_time_ns_function()
+                                if budget is not None:
+                                    # Always make some progress
+                                    if start >= deadline and fired:
+                                        break
+                                    fired = True
+                                func = item.func
+                                func(dt, *item.args, **item.kwargs)
+                                elapsed = _default_time_ns_function() - start
+                                if budget is not None and elapsed > budget:
+                                    self._get_budget_stats(func)[1] += 1
+                                if profile is not None:
+                                    self._profile_call(func, elapsed, late)
+                                called += 1
+                    except:
+                        # Items from the raising one onwards are due again
+                        # next tick
+                        due[-1] = bucket.split(called)
+                        self._reschedule_bucket(bucket, ts)
+                        raise
+                    if called < len(items):
+                        # Out of budget: the remaining items are deferred to
+                        # the next tick, where they are due before the items
+                        # that have just been called.
+                        due[-1] = bucket.split(called)
+                        self._reschedule_bucket(bucket, ts)
+                        for deferred in due:
+                            for item in deferred.items:
+                                if item.bucket is deferred:
+                                    self._get_budget_stats(item.func)[0] += 1
+                        break
+                due.pop()
+                self._reschedule_bucket(bucket, ts)
+        finally:
+            # Buckets left over by a raising callback or deferred are due
+            # again next tick
+            for bucket in due:
+                if bucket.live:
+                    self._queue_bucket(bucket)
+            self._schedule_interval_due = ()
+
+        if batches:
+            for func, (ids, dts) in batches.items():
+                if numpy is not None:
+                    ids, dts = numpy.array(ids), numpy.array(dts)
+                else:
+                    ids, dts = array.array('l', ids), array.array('d', dts)
+                if profile is None:
+                    func(ids, dts)
+                else:
+                    start = _default_time_ns_function()
+                    func(ids, dts)
+                    self._profile_call(
+                        func, _default_time_ns_function() - start, 0)
 
-        # Remove finished one-shots.
-        self._schedule_interval_items = \
-            [item for item in self._schedule_interval_items \
-             if item.next_ts is not None]
+        return result
 
-        if need_resort:
-            # TODO bubble up changed items might be faster
-            self._schedule_interval_items.sort(key=lambda a: a.next_ts)
+    def _complete_async_calls(self):
+        completions = self._completions
+        while completions:
+            callback, future = completions.popleft()
+            # Raises the exception of the call, if any
+            value = future.result()
+            if callback is not None:
+                callback(value)
 
-        return result
+    def set_wakeup_function(self, func):
+        '''Set the function called when the result of an asynchronous call
+        is ready to be delivered.
+
+        The function is called without arguments from the thread that ran
+        the call, so it must be thread-safe.  Main loops sleeping until the
+        next scheduled function is due set it to interrupt their sleep and
+        tick the clock, so that results are delivered without delay.
+
+        :Parameters:
+            `func` : function
+                The function to call, or None.
+
+        '''
+        self._wakeup = func
+
+    def set_time_budget(self, budget):
+        '''Set the time scheduled interval functions may take on each tick.
+
+        Once the budget is exhausted, the interval functions that are still
+        due are deferred to the next tick, where they are called first.  At
+        least one function is called on each tick, however long it takes.
+        Functions scheduled with `schedule` are always called, but the time
+        they take counts towards the budget.
+
+        :Parameters:
+            `budget` : float
+                Time budget in seconds, or None to always call all the due
+                functions.
+
+        '''
+        if budget is None:
+            self._budget_ns = None
+        else:
+            self._budget_ns = int(budget * 1e9)
+        self._budget_stats = {}
+
+    def get_time_budget(self):
+        '''Get the time budget of scheduled interval functions.
+
+        :rtype: float
+        :return: The time budget in seconds, or None if there is none.
+        '''
+        if self._budget_ns is None:
+            return None
+        return self._budget_ns / 1e9
+
+    def get_budget_stats(self):
+        '''Get how often each function was deferred or overran the time
+        budget since it was set.
+
+        A function overruns the budget when a single call to it takes
+        longer than the whole budget.
+
+        :rtype: dict
+        :return: A dict mapping functions to dicts with ``deferred`` and
+            ``overruns`` counts.
+        '''
+        return dict((func, {'deferred': deferred, 'overruns': overruns})
+                    for func, (deferred, overruns)
+                    in (self._budget_stats or {}).items())
+
+    def _get_budget_stats(self, func):
+        stats = self._budget_stats.get(func)
+        if stats is None:
+            stats = self._budget_stats[func] = [0, 0]
+        return stats
+
+    def set_profiling(self, enabled):
+        '''Enable or disable profiling of scheduled functions.
+
+        While enabled, the time taken by each call to a scheduled function
+        is recorded, see `get_profile`.  Functions are not wrapped, so there
+        is no overhead when profiling is disabled.  Disabling profiling
+        discards the records.
+
+        :Parameters:
+            `enabled` : bool
+                Whether to profile scheduled functions.
+
+        '''
+        if not enabled:
+            self._profile = None
+        elif self._profile is None:
+            self._profile = {}
+
+    def get_profile(self):
+        '''Get the profile of scheduled functions.
+
+        Each row holds the function along with its call ``count``, the
+        ``total``, ``mean`` and ``max`` time taken by a call, and the
+        ``overrun`` of the last call, i.e. how late it was called compared
+        to its schedule (always 0 for functions called every tick and batch
+        functions).  All times are in seconds::
+
+            for row in clock.get_profile():
+                print '%(count)6d %(total)8.3f %(max)8.3f' % row, row['func']
+
+        :rtype: list of dict
+        :return: One row per function, by decreasing total time.  Empty if
+            profiling is disabled.
+        '''
+        rows = []
+        for func, (count, total, max_, overrun) in (self._profile or {}).items():
+            rows.append({'func': func, 'count': count, 'total': total / 1e9,
+                         'mean': total / 1e9 / count, 'max': max_ / 1e9,
+                         'overrun': overrun / 1e9})
+        rows.sort(key=lambda row: row['total'], reverse=True)
+        return rows
+
+    def reset_profile(self):
+        '''Discard the profile of scheduled functions, if profiling is
+        enabled.'''
+        if self._profile is not None:
+            self._profile = {}
+
+    def _profile_call(self, func, elapsed, overrun):
+        stats = self._profile.get(func)
+        if stats is None:
+            self._profile[func] = [1, elapsed, elapsed, overrun]
+        else:
+            stats[0] += 1
+            stats[1] += elapsed
+            if elapsed > stats[2]:
+                stats[2] = elapsed
+            stats[3] = overrun
+
+    def _reschedule_bucket(self, bucket, ts):
+        '''Reschedule a bucket whose items have just been called at ts.'''
+        if bucket.live < len(bucket.items):
+            bucket.items = [item for item in bucket.items
+                                 if item.bucket is bucket]
+        if not bucket.live:
+            return
+        if not bucket.interval:
+            for item in bucket.items:
+                self._cancel_item(item)
+            return
+
+        # Try to keep timing regular, even if overslept this time; but
+        # don't schedule in the past (which could lead to infinitely-worsing
+        # error).
+        interval = bucket.interval
+        next_ts = bucket.last_ns + interval
+        last_ts = ts
+        if next_ts <= ts:
+            if ts - next_ts < 50000000:
+                # Only missed by a little bit, keep the same schedule
+                next_ts = ts + interval
+            else:
+                # Missed by heaps, do a soft reschedule to avoid lumping
+                # everything together.
+                next_ts = self._get_soft_next_ts(ts, interval)
+                # Fake last_ts to avoid repeatedly over-scheduling in future.
+                # Unfortunately means the next reported dt is incorrect
+                # (looks like interval but actually isn't).
+                last_ts = next_ts - interval
+        bucket.next_ns = next_ts
+        bucket.last_ns = last_ts
+        self._queue_bucket(bucket)
 
     def tick(self, poll=False):
         '''Signify that one frame has passed.
@@ -359,7 +1075,7 @@ class Clock(_ClockBase):
         '''
         if poll:
             if self.period_limit:
-                self.next_ts = self.next_ts + self.period_limit
+                self._next_ns = self._next_ns + self._period_ns
         else:
             if self.period_limit:
                 self._limit()
@@ -376,9 +1092,24 @@ class Clock(_ClockBase):
         `tick` if a framerate limit has been set.
 
         This method uses several heuristics to determine whether to
-        sleep or busy-wait (or both).
+        sleep or busy-wait (or both), depending on `sleep_strategy`.
         '''
-        ts = self.time()
+        ts = self._time_ns()
+        if self.sleep_strategy == self.SLEEP_PRECISE:
+            self._sleep_precise(ts)
+        else:
+            self._sleep_busy(ts)
+
+        sleeptime = self._next_ns - self._time_ns()
+        if sleeptime < -2 * self._period_ns:
+            # Missed the time by a long shot, let's reset the clock
+            # print >> sys.stderr, 'Step %f' % -sleeptime
+            self._next_ns = ts + 2 * self._period_ns
+        else:
+            # Otherwise keep the clock steady
+            self._next_ns = self._next_ns + self._period_ns
+
+    def _sleep_busy(self, ts):
         # Sleep to just before the desired time
         sleeptime = self.get_sleep_time(False)
         while sleeptime - self.SLEEP_UNDERSHOOT > self.MIN_SLEEP:
@@ -386,17 +1117,55 @@ class Clock(_ClockBase):
             sleeptime = self.get_sleep_time(False)
 
         # Busy-loop CPU to get closest to the mark
-        sleeptime = self.next_ts - self.time()
+        busy_ts = self._time_ns()
+        sleeptime = self._next_ns - busy_ts
         while sleeptime > 0:
-            sleeptime = self.next_ts - self.time()
+            sleeptime = self._next_ns - self._time_ns()
+        self._sleep_total += (busy_ts - ts) / 1e9
+        self._busy_total += (self._next_ns - sleeptime - busy_ts) / 1e9
+
+    def _sleep_precise(self, ts):
+        # Sleep in one go until the undershoot before the desired time
+        sleeptime = self.get_sleep_time(False) - self._precise_undershoot
+        if sleeptime > 0:
+            deadline = _monotonic_ns() + int(sleeptime * 1000000000)
+            _sleep_until_ns(deadline)
+            oversleep = (_monotonic_ns() - deadline) / 1000000000.
+            # Aim at twice the average oversleep, so that waking up late
+            # stays rare, but never undershoot by more than MIN_SLEEP.
+            undershoot = self._precise_undershoot
+            undershoot += 0.1 * (2 * max(oversleep, 0.) - undershoot)
+            self._precise_undershoot = min(max(undershoot, 0.0001),
+                                           self.MIN_SLEEP)
+
+        # Busy-loop the little time left
+        busy_ts = self._time_ns()
+        sleeptime = self._next_ns - busy_ts
+        while sleeptime > 0:
+            sleeptime = self._next_ns - self._time_ns()
+        self._sleep_total += (busy_ts - ts) / 1e9
+        self._busy_total += (self._next_ns - sleeptime - busy_ts) / 1e9
 
-        if sleeptime < -2 * self.period_limit:
-            # Missed the time by a long shot, let's reset the clock
-            # print >> sys.stderr, 'Step %f' % -sleeptime
-            self.next_ts = ts + 2 * self.period_limit
-        else:
-            # Otherwise keep the clock steady
-            self.next_ts = self.next_ts + self.period_limit
+    def set_sleep_strategy(self, strategy):
+        '''Set how the clock waits for the next frame when limiting
+        framerate.
+
+        :Parameters:
+            `strategy` : str
+                Either `SLEEP_BUSY` (the default), which sleeps in steps and
+                busy-waits the last `MIN_SLEEP` seconds, or `SLEEP_PRECISE`,
+                which sleeps until an absolute deadline of the monotonic
+                clock and busy-waits a fraction of a millisecond at most.
+
+        :raise ValueError: if the strategy is unknown or unavailable on
+            this platform.
+        '''
+        if strategy == self.SLEEP_PRECISE and not _precise_sleep:
+            raise ValueError('Precise sleep is not available on %s'
+                             % sys.platform)
+        if strategy not in (self.SLEEP_BUSY, self.SLEEP_PRECISE):
+            raise ValueError('Unknown sleep strategy "%s"' % strategy)
+        self.sleep_strategy = strategy
 
     def get_sleep_time(self, sleep_idle):
         '''Get the time until the next item is scheduled.
@@ -428,22 +1197,39 @@ class Clock(_ClockBase):
 
         :since: pyglet 1.1
         '''
-        if self._schedule_items or not sleep_idle:
+        if self._completions:
+            # Results of asynchronous calls are waiting to be delivered
+            return 0.
+        if (len(self._schedule_items) > self._schedule_items_dead or
+            not sleep_idle):
             if not self.period_limit:
                 return 0.
             else:
-                wake_time = self.next_ts
-                if self._schedule_interval_items:
-                    wake_time = min(wake_time,
-                                    self._schedule_interval_items[0].next_ts)
-                return max(wake_time - self.time(), 0.)
-
-        if self._schedule_interval_items:
-            return max(self._schedule_interval_items[0].next_ts - self.time(),
-                       0)
+                wake_time = self._next_ns
+                next_ts = self._get_next_interval_ts()
+                if next_ts is not None:
+                    wake_time = min(wake_time, next_ts)
+                return max(wake_time - self._time_ns(), 0) / 1e9
+
+        next_ts = self._get_next_interval_ts()
+        if next_ts is not None:
+            return max(next_ts - self._time_ns(), 0) / 1e9
             
         return None
 
+    def _get_next_interval_ts(self):
+        '''Return the time of the earliest scheduled interval item, or None
+        if there is none.  Unscheduled items found on top of the heap are
+        discarded on the way.
+        '''
+        heap = self._schedule_interval_items
+        while heap and not heap[0][2].live:
+            heapq.heappop(heap)
+            self._schedule_interval_dead -= 1
+        if heap:
+            return heap[0][0]
+        return None
+
     def set_fps_limit(self, fps_limit):
         '''Set the framerate limit.
 
@@ -460,9 +1246,12 @@ class Clock(_ClockBase):
         '''
         if not fps_limit:
             self.period_limit = None
+            self._period_ns = 0
         else:
             self.period_limit = 1. / fps_limit
+            self._period_ns = int(round(1e9 / fps_limit))
         self.window_size = fps_limit or 60
+        self.frame_times.resize(self.window_size)
 
     def get_fps_limit(self):
         '''Get the framerate limit.
@@ -485,9 +1274,33 @@ class Clock(_ClockBase):
         :rtype: float
         :return: The measured frames per second.
         '''
-        if not self.cumulative_time: 
+        if not self.frame_times.total:
             return 0
-        return len(self.times) / self.cumulative_time
+        return len(self.frame_times) / self.frame_times.total
+
+    def get_frame_stats(self):
+        '''Get statistics about the duration of recent frames.
+
+        The statistics cover the same sliding window of frames as `get_fps`
+        and are cheap enough to be polled every second or so.
+
+        :rtype: dict
+        :return: The ``fps`` plus the frame duration statistics described
+            in `FrameTimes.get_stats`, in seconds.  ``sleep_time`` and
+            ``busy_time`` give the total time spent sleeping and
+            busy-waiting while limiting framerate, and ``cpu_saved`` the
+            fraction of that waiting time that did not use the CPU.
+        '''
+        stats = self.frame_times.get_stats()
+        stats['fps'] = self.get_fps()
+        stats['sleep_time'] = self._sleep_total
+        stats['busy_time'] = self._busy_total
+        waited = self._sleep_total + self._busy_total
+        if waited:
+            stats['cpu_saved'] = self._sleep_total / waited
+        else:
+            stats['cpu_saved'] = 0.
+        return stats
 
     def schedule(self, func, *args, **kwargs):
         '''Schedule a function to be called every frame.
@@ -503,21 +1316,114 @@ class Clock(_ClockBase):
         :Parameters:
             `func` : function
                 The function to call each frame.
+
+        :rtype: `_ScheduledItem`
+        :return: A handle whose ``cancel`` method removes this scheduling
+            of the function.
         '''
-        item = _ScheduledItem(func, args, kwargs)
+        item = _ScheduledItem(func, args, kwargs, self)
         self._schedule_items.append(item)
+        self._index_item(item)
+        return item
 
     def _schedule_item(self, func, last_ts, next_ts, interval, *args, **kwargs):
-        item = _ScheduledIntervalItem(
-            func, interval, last_ts, next_ts, args, kwargs)
-
-        # Insert in sort order
-        for i, other in enumerate(self._schedule_interval_items):
-            if other.next_ts is not None and other.next_ts > next_ts:
-                self._schedule_interval_items.insert(i, item)
-                break
+        item = _ScheduledIntervalItem(func, args, kwargs, self)
+        self._add_item(item, last_ts, next_ts, interval)
+        self._index_item(item)
+        return item
+
+    def _add_item(self, item, last_ts, next_ts, interval, batch=None):
+        bucket = self._schedule_buckets.get((next_ts, interval, last_ts, batch))
+        if bucket is None:
+            bucket = _ScheduledBucket(interval, last_ts, next_ts, batch)
+            bucket.add([item])
+            self._queue_bucket(bucket)
+        else:
+            bucket.add([item])
+
+    def _index_item(self, item):
+        try:
+            items = self._schedule_functions.get(item.func)
+        except TypeError:
+            self._schedule_unhashable.append(item)
+            return
+        if items is None:
+            self._schedule_functions[item.func] = set([item])
         else:
-            self._schedule_interval_items.append(item)
+            items.add(item)
+
+    def _cancel_item(self, item):
+        try:
+            items = self._schedule_functions.get(item.func)
+        except TypeError:
+            self._schedule_unhashable.remove(item)
+            items = None
+        if items is not None:
+            items.discard(item)
+            if not items:
+                del self._schedule_functions[item.func]
+        self._kill_item(item)
+
+    def _kill_item(self, item):
+        # Replace the func with a dummy that does nothing, in case the item
+        # has already been picked up inside tick() (fixes issue 326).  The
+        # item itself is reclaimed later by the scheduler.
+        item.func = _dummy_schedule_func
+        if type(item) is _ScheduledItem:
+            self._schedule_items_dead += 1
+            return
+
+        bucket = item.bucket
+        if bucket is None:
+            return
+        item.bucket = None
+        bucket.live -= 1
+        if bucket.live or bucket.key is None:
+            return
+
+        # Last item of a bucket waiting in the heap
+        del self._schedule_buckets[bucket.key]
+        bucket.key = None
+        index = self._soft_index
+        if index is not None:
+            i = bisect.bisect_left(index, bucket.next_ns)
+            if i < len(index) and index[i] == bucket.next_ns:
+                del index[i]
+        self._schedule_interval_dead += 1
+        # Dead buckets are discarded as they are popped off the heap; only
+        # rebuild it once they make up most of it.
+        heap = self._schedule_interval_items
+        if self._schedule_interval_dead > len(heap) // 2:
+            heap[:] = [entry for entry in heap if entry[2].live]
+            heapq.heapify(heap)
+            self._schedule_interval_dead = 0
+
+    def _queue_bucket(self, bucket):
+        '''Push a bucket onto the heap, or merge it into the bucket already
+        there with the same timing.'''
+        next_ts = bucket.next_ns
+        key = (next_ts, bucket.interval, bucket.last_ns, bucket.batch)
+        buckets = self._schedule_buckets
+        if key in buckets:
+            buckets[key].add(
+                [item for item in bucket.items if item.bucket is bucket])
+            return
+        bucket.key = key
+        buckets[key] = bucket
+        # The sequence number keeps buckets due at the same time in the
+        # order they were scheduled, and the bucket itself out of
+        # comparisons.
+        heapq.heappush(self._schedule_interval_items,
+                       (next_ts, next(self._schedule_sequence), bucket))
+        if self._soft_index is not None:
+            bisect.insort(self._soft_index, next_ts)
+
+    def _get_soft_index(self):
+        if self._soft_index is None:
+            self._soft_index = sorted(
+                [next_ts for next_ts, _, bucket in self._schedule_interval_items
+                         if bucket.live])
+        return self._soft_index
 
     def schedule_interval(self, func, interval, *args, **kwargs):
         '''Schedule a function to be called every `interval` seconds.
@@ -533,8 +1439,11 @@ class Clock(_ClockBase):
             `interval` : float
                 The number of seconds to wait between each call.
 
+        :rtype: `_ScheduledIntervalItem`
+        :return: A handle whose ``cancel`` method removes this scheduling
+            of the function.
         '''
-        last_ts = self.last_ts or self.next_ts
+        last_ts = self._last_ns or self._next_ns
 
         # Schedule from now, unless now is sufficiently close to last_ts, in
         # which case use last_ts.  This clusters together scheduled items that
@@ -542,12 +1451,14 @@ class Clock(_ClockBase):
         # behaviour was to always use self.last_ts, and not look at ts.  The
         # new behaviour is needed because clock ticks can now be quite
         # irregular, and span several seconds.
-        ts = self.time()
-        if ts - last_ts > 0.2:
+        ts = self._time_ns()
+        if ts - last_ts > 200000000:
             last_ts = ts
 
+        interval = _interval_ns(interval)
         next_ts = last_ts + interval
-        self._schedule_item(func, last_ts, next_ts, interval, *args, **kwargs)
+        return self._schedule_item(func, last_ts, next_ts, interval,
+                                   *args, **kwargs)
 
     def schedule_interval_soft(self, func, interval, *args, **kwargs):
         '''Schedule a function to be called every `interval` seconds,
@@ -579,65 +1490,81 @@ class Clock(_ClockBase):
             `interval` : float
                 The number of seconds to wait between each call.
 
+        :rtype: `_ScheduledIntervalItem`
+        :return: A handle whose ``cancel`` method removes this scheduling
+            of the function.
         '''
-        last_ts = self.last_ts or self.next_ts
+        last_ts = self._last_ns or self._next_ns
 
         # See schedule_interval
-        ts = self.time()
-        if ts - last_ts > 0.2:
+        ts = self._time_ns()
+        if ts - last_ts > 200000000:
             last_ts = ts
 
+        interval = _interval_ns(interval)
         next_ts = self._get_soft_next_ts(last_ts, interval)
         last_ts = next_ts - interval
-        self._schedule_item(func, last_ts, next_ts, interval, *args, **kwargs)
+        return self._schedule_item(func, last_ts, next_ts, interval,
+                                   *args, **kwargs)
 
     def _get_soft_next_ts(self, last_ts, interval):
+        index = self._get_soft_index()
         def taken(ts, e):
             '''Return True if the given time has already got an item
             scheduled nearby.
             '''
-            for item in self._schedule_interval_items:
-                if item.next_ts is None:
-                    pass
-                elif abs(item.next_ts - ts) <= e:
-                    return True
-                elif item.next_ts > ts + e:
-                    return False
-            return False
+            i = bisect.bisect_left(index, ts - e)
+            return i < len(index) and index[i] <= ts + e
 
         # Binary division over interval:
         #
         # 0                          interval
         # |--------------------------|
-        #   5  3   6   2   7  4  8   1          Order of search
+        #                            1          First try
+        #   2  2   2   2   2  2  2              Then any free slot of divs
         #
         # i.e., first scheduled at interval,
-        #       then at            interval/2 
-        #       then at            interval/4 
-        #       then at            interval*3/4
-        #       then at            ...
+        #       then at a free slot of the interval divided in divs parts,
+        #       divs being a power of two.
         #
         # Schedule is hopefully then evenly distributed for any interval,
         # and any number of scheduled functions.
 
         next_ts = last_ts + interval
-        if not taken(next_ts, interval / 4):
+        if not taken(next_ts, interval // 4):
             return next_ts
 
-        dt = interval
-        divs = 1
-        while True:
-            next_ts = last_ts
-            for i in range(divs - 1):
-                next_ts += dt
-                if not taken(next_ts, dt / 4):
-                    return next_ts
-            dt /= 2
+        # Slots of a division are dt apart and an item only takes a slot if
+        # it is less than dt/4 away, so each item takes at most one slot.
+        # The first division having more slots than there are items over the
+        # interval thus has a free slot; coarser divisions are very likely
+        # full and are not searched.
+        count = (bisect.bisect_right(index, last_ts + interval) -
+                 bisect.bisect_right(index, last_ts))
+        divs = 2
+        while divs - 1 <= count:
             divs *= 2
-            
-            # Avoid infinite loop in pathological case
-            if divs > 16:
-                return next_ts
+        dt = interval // divs
+        e = dt // 4
+
+        # Avoid infinite loop in pathological case
+        if dt == 0:
+            return next_ts
+
+        # Bisect for a slot k such that slots 1..k-1 have at least k-1
+        # items over them but slots 1..k have less than k: there is then no
+        # item around slot k.  Each step is O(log n) in the number of items.
+        start = bisect.bisect_left(index, last_ts + dt - e)
+        def items(k):
+            return bisect.bisect_right(index, last_ts + k * dt + e) - start
+        lo, hi = 0, divs - 1
+        while hi - lo > 1:
+            k = (lo + hi) // 2
+            if items(k) < k:
+                hi = k
+            else:
+                lo = k
+        return last_ts + hi * dt
 
     def schedule_once(self, func, delay, *args, **kwargs):
         '''Schedule a function to be called once after `delay` seconds.
@@ -649,16 +1576,124 @@ class Clock(_ClockBase):
                 The function to call when the timer lapses.
             `delay` : float
                 The number of seconds to wait before the timer lapses.
+
+        :rtype: `_ScheduledIntervalItem`
+        :return: A handle whose ``cancel`` method removes this scheduling
+            of the function.
         '''
-        last_ts = self.last_ts or self.next_ts
+        last_ts = self._last_ns or self._next_ns
 
         # See schedule_interval
-        ts = self.time()
-        if ts - last_ts > 0.2:
+        ts = self._time_ns()
+        if ts - last_ts > 200000000:
             last_ts = ts
 
-        next_ts = last_ts + delay
-        self._schedule_item(func, last_ts, next_ts, 0, *args, **kwargs)
+        next_ts = last_ts + int(round(delay * 1e9))
+        return self._schedule_item(func, last_ts, next_ts, 0, *args, **kwargs)
+
+    def schedule_interval_batch(self, func, interval, id):
+        '''Schedule a batch function to be called every `interval` seconds
+        for the given id.
+
+        The same batch function may be scheduled for many ids.  Rather than
+        being called once per id, it is called once per tick with the ids
+        that are due and the elapsed time for each of them, as NumPy arrays
+        (or `array.array` if NumPy is not installed)::
+
+            def callback(ids, dts):
+                positions[ids] += velocities[ids] * dts
+
+            for id in range(1000):
+                clock.schedule_interval_batch(callback, .5, id)
+
+        :Parameters:
+            `func` : function
+                The batch function to call when timers lapse.
+            `interval` : float
+                The number of seconds to wait between each call.
+            `id` : int
+                The id passed to the batch function.
+
+        :rtype: `_ScheduledIntervalItem`
+        :return: A handle whose ``cancel`` method removes this scheduling
+            of the function for this id.
+        '''
+        last_ts = self._last_ns or self._next_ns
+
+        # See schedule_interval
+        ts = self._time_ns()
+        if ts - last_ts > 200000000:
+            last_ts = ts
+
+        interval = _interval_ns(interval)
+        item = _ScheduledIntervalItem(func, (id,), {}, self)
+        self._add_item(item, last_ts, last_ts + interval, interval, func)
+        self._index_item(item)
+        return item
+
+    def schedule_interval_async(self, func, interval, executor,
+                                *args, **kwargs):
+        '''Schedule a function to be called every `interval` seconds by an
+        executor.
+
+        The function is submitted to the executor (for example a
+        `concurrent.futures` thread or process pool) rather than called, so
+        that blocking work does not stall the thread ticking the clock.  Its
+        result is passed to `callback`, if given, from within `tick` once
+        the call completes; an exception raised by the function is raised
+        by `tick` instead.  A call is skipped if the previous one is still
+        running.  Additional arguments are passed on to the function, and
+        the callback can only be given as a keyword argument::
+
+            clock.schedule_interval_async(fetch, 5, executor, url,
+                                          callback=update)
+
+        Results of calls already submitted are still delivered after the
+        function has been unscheduled.
+
+        :Parameters:
+            `func` : function
+                The function to submit when the timer lapses.  For a process
+                pool, it must be picklable.
+            `interval` : float
+                The number of seconds to wait between each call.
+            `executor` : `concurrent.futures.Executor`
+                The executor running the function.
+            `callback` : function
+                Function called with the result of each call (keyword
+                only).
+
+        :rtype: `_ScheduledIntervalItem`
+        :return: A handle whose ``cancel`` method removes this scheduling
+            of the function.
+        '''
+        callback = kwargs.pop('callback', None)
+        call = _AsyncCall(func, executor, callback, self)
+        return self.schedule_interval(call, interval, *args, **kwargs)
+
+    def schedule_once_async(self, func, delay, executor, *args, **kwargs):
+        '''Schedule a function to be called once after `delay` seconds by an
+        executor.
+
+        See `schedule_interval_async`.
+
+        :Parameters:
+            `func` : function
+                The function to submit when the timer lapses.
+            `delay` : float
+                The number of seconds to wait before the timer lapses.
+            `executor` : `concurrent.futures.Executor`
+                The executor running the function.
+            `callback` : function
+                Function called with the result of the call (keyword only).
+
+        :rtype: `_ScheduledIntervalItem`
+        :return: A handle whose ``cancel`` method removes this scheduling
+            of the function.
+        '''
+        callback = kwargs.pop('callback', None)
+        call = _AsyncCall(func, executor, callback, self)
+        return self.schedule_once(call, delay, *args, **kwargs)
 
     def unschedule(self, func):
         '''Remove a function from the schedule.  
@@ -671,25 +1706,19 @@ class Clock(_ClockBase):
                 The function to remove from the schedule.
 
         '''
-        # First replace zombie items' func with a dummy func that does
-        # nothing, in case the list has already been cloned inside tick().
-        # (Fixes issue 326).
-        for item in self._schedule_items:
-            if item.func == func:
-                item.func = _dummy_schedule_func
-
-        for item in self._schedule_interval_items:
-            if item.func == func:
-                item.func = _dummy_schedule_func
-    
-        # Now remove matching items from both schedule lists.
-        self._schedule_items = \
-            [item for item in self._schedule_items \
-                  if item.func is not _dummy_schedule_func]
-
-        self._schedule_interval_items = \
-            [item for item in self._schedule_interval_items \
-                  if item.func is not _dummy_schedule_func]
+        try:
+            hash(func)
+        except TypeError:
+            items = [item for item in self._schedule_unhashable
+                          if item.func == func]
+            if items:
+                self._schedule_unhashable = \
+                    [item for item in self._schedule_unhashable
+                          if item.func != func]
+        else:
+            items = self._schedule_functions.pop(func, ())
+        for item in items:
+            self._kill_item(item)
 
 # Default clock.
 _default = Clock()
@@ -762,6 +1791,15 @@ def get_fps():
     '''
     return _default.get_fps()
 
+def get_frame_stats():
+    '''Return statistics about recent frames of the default clock.
+
+    See `Clock.get_frame_stats` for details.
+
+    :rtype: dict
+    '''
+    return _default.get_frame_stats()
+
 def set_fps_limit(fps_limit):
     '''Set the framerate limit for the default clock.
 
@@ -774,6 +1812,20 @@ def set_fps_limit(fps_limit):
     '''
     _default.set_fps_limit(fps_limit)
 
+def set_time_budget(budget):
+    '''Set the time scheduled interval functions may take on each tick of
+    the default clock.
+
+    :see: `Clock.set_time_budget`
+
+    :Parameters:
+        `budget` : float
+            Time budget in seconds, or None to always call all the due
+            functions.
+
+    '''
+    _default.set_time_budget(budget)
+
 def get_fps_limit():
     '''Get the framerate limit for the default clock.
 
@@ -793,7 +1845,7 @@ def schedule(func, *args, **kwargs):
         `func` : function
             The function to call each frame.
     '''
-    _default.schedule(func, *args, **kwargs)
+    return _default.schedule(func, *args, **kwargs)
 
 def schedule_interval(func, interval, *args, **kwargs):
     '''Schedule 'func' to be called every 'interval' seconds on the default
@@ -809,7 +1861,7 @@ def schedule_interval(func, interval, *args, **kwargs):
             The number of seconds to wait between each call.
 
     '''
-    _default.schedule_interval(func, interval, *args, **kwargs)
+    return _default.schedule_interval(func, interval, *args, **kwargs)
 
 def schedule_interval_soft(func, interval, *args, **kwargs):
     '''Schedule 'func' to be called every 'interval' seconds on the default
@@ -830,7 +1882,64 @@ def schedule_interval_soft(func, interval, *args, **kwargs):
             The number of seconds to wait between each call.
 
     '''
-    _default.schedule_interval_soft(func, interval, *args, **kwargs)
+    return _default.schedule_interval_soft(func, interval, *args, **kwargs)
+
+def schedule_interval_batch(func, interval, id):
+    '''Schedule the batch function 'func' to be called every 'interval'
+    seconds for 'id' on the default clock.
+
+    :see: `Clock.schedule_interval_batch`
+
+    :Parameters:
+        `func` : function
+            The batch function to call when timers lapse.
+        `interval` : float
+            The number of seconds to wait between each call.
+        `id` : int
+            The id passed to the batch function.
+
+    '''
+    return _default.schedule_interval_batch(func, interval, id)
+
+def schedule_interval_async(func, interval, executor, *args, **kwargs):
+    '''Schedule 'func' to be submitted to 'executor' every 'interval'
+    seconds on the default clock, its result being passed to 'callback'.
+
+    :see: `Clock.schedule_interval_async`
+
+    :Parameters:
+        `func` : function
+            The function to submit when the timer lapses.
+        `interval` : float
+            The number of seconds to wait between each call.
+        `executor` : `concurrent.futures.Executor`
+            The executor running the function.
+        `callback` : function
+            Function called with the result of each call (keyword only).
+
+    '''
+    return _default.schedule_interval_async(func, interval, executor,
+                                            *args, **kwargs)
+
+def schedule_once_async(func, delay, executor, *args, **kwargs):
+    '''Schedule 'func' to be submitted to 'executor' once after 'delay'
+    seconds on the default clock, its result being passed to 'callback'.
+
+    :see: `Clock.schedule_once_async`
+
+    :Parameters:
+        `func` : function
+            The function to submit when the timer lapses.
+        `delay` : float
+            The number of seconds to wait before the timer lapses.
+        `executor` : `concurrent.futures.Executor`
+            The executor running the function.
+        `callback` : function
+            Function called with the result of the call (keyword only).
+
+    '''
+    return _default.schedule_once_async(func, delay, executor,
+                                        *args, **kwargs)
 
 def schedule_once(func, delay, *args, **kwargs):
     '''Schedule 'func' to be called once after 'delay' seconds (can be
@@ -848,7 +1957,7 @@ def schedule_once(func, delay, *args, **kwargs):
             The number of seconds to wait before the timer lapses.
  
     ''' 
-    _default.schedule_once(func, delay, *args, **kwargs)
+    return _default.schedule_once(func, delay, *args, **kwargs)
 
 def unschedule(func):
     '''Remove 'func' from the default clock's schedule.  No error
@@ -28,6 +28,8 @@ class Configuration(object):
         self._minor_version       = 1
         self._profile             = "compatibility"
 
+        self._vsync               = False
+
 
     # ---------------------------------------------------------------- repr ---
     def __repr__(self):
@@ -46,7 +48,8 @@ class Configuration(object):
         s += "Anti-aliasing samples: %d\n" % (self._samples)
         s += "GL Version:            %d.%d\n" % (self._major_version,
                                                  self._minor_version)
-        s += "GL Profile:            %s" % (self._profile)
+        s += "GL Profile:            %s\n" % (self._profile)
+        s += "Vertical sync:         %s" % (self._vsync)
         return s
 
 
@@ -169,6 +172,37 @@ class Configuration(object):
         return self._srgb
 
 
+    # --------------------------------------------------------------- vsync ---
+    @property
+    def vsync(self):
+        """
+        Whether buffer swaps are synchronized with the vertical retrace of
+        the display: False, True or "adaptive".  Adaptive sync only waits
+        for the retrace when the frame is on time and swaps immediately
+        (tearing) when it is late.  It falls back to regular sync where it
+        is not supported.
+        """
+        return self._vsync
+
+    @vsync.setter
+    def vsync(self, value):
+        if value not in (False, True, "adaptive"):
+            raise ValueError('vsync must be False, True or "adaptive"')
+        self._vsync = value
+
+
+    # ------------------------------------------------------- swap interval ---
+    @property
+    def swap_interval(self):
+        """
+        Swap interval corresponding to the vsync setting: 0 (no sync),
+        1 (sync) or -1 (adaptive sync).
+        """
+        if self._vsync == "adaptive":
+            return -1
+        return int(bool(self._vsync))
+
+
 
 # ---------------------------------------------------- gl_get_configuration ---
 def gl_get_configuration():
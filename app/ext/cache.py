@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2014, Vispy Development Team.
+# Distributed under the (new) BSD License. See LICENSE.txt for more info.
+# -----------------------------------------------------------------------------
+"""
+JSON caches in the user cache directory.
+
+A cache is a dict of entries stored along with a stamp describing what the
+entries depend on; it is discarded as a whole when the stamp changes.  Used
+to remember resolved native libraries (see `app.ext.library`) and backend
+probes (see `app.backends`) across processes.
+"""
+import os
+import json
+
+
+def cache_path(variable, name):
+    """ Path of a cache file.
+
+    It is given by an environment variable, if set (an empty value disables
+    the cache), otherwise it is in the user cache directory.
+
+    :Parameters:
+
+        ``variable``: str
+            Environment variable overriding the path
+
+        ``name``: str
+            File name of the cache in the user cache directory
+
+    :rtype: str
+    :return: The path of the cache, or None if it is disabled
+    """
+
+    path = os.environ.get(variable)
+    if path is not None:
+        return path or None
+    root = os.environ.get('XDG_CACHE_HOME') or \
+           os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(root, 'vispy-app', name)
+
+
+def load(path, stamp):
+    """ Load the entries of a cache, empty if the cache is disabled,
+    missing, unreadable or has another stamp.
+
+    :rtype: dict
+    """
+
+    if path is None:
+        return {}
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except (IOError, OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get('stamp') != stamp:
+        return {}
+    entries = cache.get('entries')
+    if not isinstance(entries, dict):
+        return {}
+    return entries
+
+
+def save(path, stamp, entries):
+    """ Save the entries of a cache, ignoring errors (the cache is only an
+    optimization). """
+
+    if path is None:
+        return
+    temporary = path + '.%d' % os.getpid()
+    try:
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        # Write then rename, so that concurrent processes never read a
+        # partial file
+        with open(temporary, 'w') as f:
+            json.dump({'stamp': stamp, 'entries': entries}, f)
+        os.rename(temporary, path)
+    except (IOError, OSError):
+        pass
@@ -34,33 +34,17 @@
 # NOTE:
 # This source has been modified from its original form by the vispy dev team
 
-import os
-import ctypes.util
+import ctypes
 from ctypes import (Structure, POINTER, CFUNCTYPE, byref, c_char_p, c_int,
-                    c_uint, c_double, c_float, c_ushort)
+                    c_uint, c_double, c_float, c_ushort, c_void_p)
+from . library import load_library
 
 
-_glfw_file = None
-
-# First if there is an environment variable pointing to the library
-if 'GLFW_LIBRARY' in os.environ:
-    if os.path.exists(os.environ['GLFW_LIBRARY']):
-        _glfw_file = os.path.realpath(os.environ['GLFW_LIBRARY'])
-
-# Else, try to find it
-if _glfw_file is None:
-    order = ['glfw', 'glfw3']
-    for check in order:
-        _glfw_file = ctypes.util.find_library(check)
-        if _glfw_file is not None:
-            break
-
-# Else, we failed and exit
-if _glfw_file is None:
-    raise OSError('GLFW library not found')
-
-# Load it
-_glfw = ctypes.CDLL(_glfw_file)
+# Load the library, from the path given by the GLFW_LIBRARY environment
+# variable if set
+_glfw = load_library('glfw', ['glfw', 'glfw3'],
+                     ['libglfw.so.3', 'libglfw.3.dylib', 'glfw3.dll'],
+                     'GLFW_LIBRARY')
 
 
 # Ensure it's new enough
@@ -423,6 +407,17 @@ glfwGetWindowUserPointer       = _glfw.glfwGetWindowUserPointer
 # glfwSetFramebufferSizeCallback = _glfw.glfwSetFramebufferSizeCallback
 glfwPollEvents                 = _glfw.glfwPollEvents
 glfwWaitEvents                 = _glfw.glfwWaitEvents
+try:
+    # Only available since GLFW 3.2
+    glfwWaitEventsTimeout          = _glfw.glfwWaitEventsTimeout
+    glfwWaitEventsTimeout.argtypes = [c_double]
+except AttributeError:
+    pass
+try:
+    # Only available since GLFW 3.1
+    glfwPostEmptyEvent             = _glfw.glfwPostEmptyEvent
+except AttributeError:
+    pass
 
 # --- Input -------------------------------------------------------------------
 glfwGetInputMode               = _glfw.glfwGetInputMode
@@ -465,50 +460,48 @@ glfwGetProcAddress             = _glfw.glfwGetProcAddress
 
 # --- Pythonizer --------------------------------------------------------------
 
-# This keeps track of current windows
-__windows__ = []
-__destroyed__ = []
-
-# This is to prevent garbage collection on callbacks
+# This keeps track of current windows, by address
+__windows__ = {}
+
+# Python callbacks of each window, by callback type then window address
+__py_callbacks__ = { 'windowposfun'       : {},
+                     'windowsizefun'      : {},
+                     'windowclosefun'     : {},
+                     'windowrefreshfun'   : {},
+                     'windowfocusfun'     : {},
+                     'windowiconifyfun'   : {},
+                     'framebuffersizefun' : {},
+                     'keyfun'             : {},
+                     'charfun'            : {},
+                     'mousebuttonfun'     : {},
+                     'cursorposfun'       : {},
+                     'cursorenterfun'     : {},
+                     'scrollfun'          : {} }
+
+# This is to prevent garbage collection on the error and monitor callbacks
 __c_callbacks__ = {}
-__py_callbacks__ = {}
+
+
+def _address(window):
+    return ctypes.cast(window, c_void_p).value
 
 
 def glfwCreateWindow(width=640, height=480, title="GLFW Window",
                      monitor=None, share=None):
     _glfw.glfwCreateWindow.restype = POINTER(GLFWwindow)
     window = _glfw.glfwCreateWindow(width,height,title,monitor,share)
-    __windows__.append(window)
-    __destroyed__.append(False)
-    index = __windows__.index(window)
-    __c_callbacks__[index] = {}
-    __py_callbacks__[index] = { 'errorfun'           : None,
-                                'monitorfun'         : None,
-                                'windowposfun'       : None,
-                                'windowsizefun'      : None,
-                                'windowclosefun'     : None,
-                                'windowrefreshfun'   : None,
-                                'windowfocusfun'     : None,
-                                'windowiconifyfun'   : None,
-                                'framebuffersizefun' : None,
-                                'keyfun'             : None,
-                                'charfun'            : None,
-                                'mousebuttonfun'     : None,
-                                'cursorposfun'       : None,
-                                'cursorenterfun'     : None,
-                                'scrollfun'          : None }
+    if window:
+        __windows__[_address(window)] = window
     return window
 
 
 def glfwDestroyWindow(window):
-    index = __windows__.index(window)
-    if not __destroyed__[index]:
+    address = _address(window)
+    if address in __windows__:
         _glfw.glfwDestroyWindow(window)
-        # We do not delete window from the list (or it would impact numbering)
-        del __c_callbacks__[index]
-        del __py_callbacks__[index]
-        # del __windows__[index]
-    __destroyed__[index] = True
+        del __windows__[address]
+        for callbacks in __py_callbacks__.values():
+            callbacks.pop(address, None)
 
 
 def glfwGetWindowPos(window):
@@ -610,32 +603,121 @@ def glfwGetJoystickButtons(joy):
 
 # --- Callbacks ---------------------------------------------------------------
 
-def __callback__(name):
-    callback = 'glfwSet%sCallback' % name
-    fun      = '%sfun' % name.lower()
-    code = """
-def %(callback)s(window, callback = None):
-    index = __windows__.index(window)
-    old_callback = __py_callbacks__[index]['%(fun)s']
-    __py_callbacks__[index]['%(fun)s'] = callback
-    if callback: callback = %(fun)s(callback)
-    __c_callbacks__[index]['%(fun)s'] = callback
-    _glfw.%(callback)s(window, callback)
-    return old_callback"""  % {'callback': callback, 'fun': fun}
-    return code
-
-exec(__callback__('Error'))
-exec(__callback__('Monitor'))
-exec(__callback__('WindowPos'))
-exec(__callback__('WindowSize'))
-exec(__callback__('WindowClose'))
-exec(__callback__('WindowRefresh'))
-exec(__callback__('WindowFocus'))
-exec(__callback__('WindowIconify'))
-exec(__callback__('FramebufferSize'))
-exec(__callback__('Key'))
-exec(__callback__('Char'))
-exec(__callback__('MouseButton'))
-exec(__callback__('CursorPos'))
-exec(__callback__('CursorEnter'))
-exec(__callback__('Scroll'))
+# Window callbacks all go through a single C thunk per callback type, built
+# once, which looks the Python callback up by window address.  The thunks
+# take the window as a plain address so that no pointer object is built
+# for each event, the callback being given the window pointer returned by
+# glfwCreateWindow.
+
+def __thunk__(fun, *argtypes):
+    callbacks = __py_callbacks__[fun]
+    windows = __windows__
+    def thunk(address, *args):
+        callback = callbacks.get(address)
+        if callback is not None:
+            callback(windows[address], *args)
+    return CFUNCTYPE(None, c_void_p, *argtypes)(thunk)
+
+__thunks__ = {
+    'windowposfun'       : __thunk__('windowposfun', c_int, c_int),
+    'windowsizefun'      : __thunk__('windowsizefun', c_int, c_int),
+    'windowclosefun'     : __thunk__('windowclosefun'),
+    'windowrefreshfun'   : __thunk__('windowrefreshfun'),
+    'windowfocusfun'     : __thunk__('windowfocusfun', c_int),
+    'windowiconifyfun'   : __thunk__('windowiconifyfun', c_int),
+    'framebuffersizefun' : __thunk__('framebuffersizefun', c_int, c_int),
+    'keyfun'             : __thunk__('keyfun', c_int, c_int, c_int, c_int),
+    'charfun'            : __thunk__('charfun', c_uint),
+    'mousebuttonfun'     : __thunk__('mousebuttonfun', c_int, c_int, c_int),
+    'cursorposfun'       : __thunk__('cursorposfun', c_double, c_double),
+    'cursorenterfun'     : __thunk__('cursorenterfun', c_int),
+    'scrollfun'          : __thunk__('scrollfun', c_double, c_double) }
+
+
+def __set_callback__(fun, setter, window, callback):
+    address = _address(window)
+    callbacks = __py_callbacks__[fun]
+    old_callback = callbacks.get(address)
+    if callback:
+        if old_callback is None:
+            setter(window, __thunks__[fun])
+        callbacks[address] = callback
+    else:
+        if old_callback is not None:
+            setter(window, None)
+        callbacks.pop(address, None)
+    return old_callback
+
+
+def __set_global_callback__(fun, cfunctype, setter, callback):
+    old_callback, c_callback = __c_callbacks__.get(fun, (None, None))
+    if callback:
+        c_callback = cfunctype(callback)
+    else:
+        callback = c_callback = None
+    __c_callbacks__[fun] = callback, c_callback
+    setter(c_callback)
+    return old_callback
+
+def glfwSetErrorCallback(callback = None):
+    return __set_global_callback__('errorfun', errorfun,
+                                   _glfw.glfwSetErrorCallback, callback)
+
+def glfwSetMonitorCallback(callback = None):
+    return __set_global_callback__('monitorfun', monitorfun,
+                                   _glfw.glfwSetMonitorCallback, callback)
+
+def glfwSetWindowPosCallback(window, callback = None):
+    return __set_callback__('windowposfun', _glfw.glfwSetWindowPosCallback,
+                            window, callback)
+
+def glfwSetWindowSizeCallback(window, callback = None):
+    return __set_callback__('windowsizefun', _glfw.glfwSetWindowSizeCallback,
+                            window, callback)
+
+def glfwSetWindowCloseCallback(window, callback = None):
+    return __set_callback__('windowclosefun', _glfw.glfwSetWindowCloseCallback,
+                            window, callback)
+
+def glfwSetWindowRefreshCallback(window, callback = None):
+    return __set_callback__('windowrefreshfun',
+                            _glfw.glfwSetWindowRefreshCallback,
+                            window, callback)
+
+def glfwSetWindowFocusCallback(window, callback = None):
+    return __set_callback__('windowfocusfun', _glfw.glfwSetWindowFocusCallback,
+                            window, callback)
+
+def glfwSetWindowIconifyCallback(window, callback = None):
+    return __set_callback__('windowiconifyfun',
+                            _glfw.glfwSetWindowIconifyCallback,
+                            window, callback)
+
+def glfwSetFramebufferSizeCallback(window, callback = None):
+    return __set_callback__('framebuffersizefun',
+                            _glfw.glfwSetFramebufferSizeCallback,
+                            window, callback)
+
+def glfwSetKeyCallback(window, callback = None):
+    return __set_callback__('keyfun', _glfw.glfwSetKeyCallback,
+                            window, callback)
+
+def glfwSetCharCallback(window, callback = None):
+    return __set_callback__('charfun', _glfw.glfwSetCharCallback,
+                            window, callback)
+
+def glfwSetMouseButtonCallback(window, callback = None):
+    return __set_callback__('mousebuttonfun', _glfw.glfwSetMouseButtonCallback,
+                            window, callback)
+
+def glfwSetCursorPosCallback(window, callback = None):
+    return __set_callback__('cursorposfun', _glfw.glfwSetCursorPosCallback,
+                            window, callback)
+
+def glfwSetCursorEnterCallback(window, callback = None):
+    return __set_callback__('cursorenterfun', _glfw.glfwSetCursorEnterCallback,
+                            window, callback)
+
+def glfwSetScrollCallback(window, callback = None):
+    return __set_callback__('scrollfun', _glfw.glfwSetScrollCallback,
+                            window, callback)
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2014, Vispy Development Team.
+# Distributed under the (new) BSD License. See LICENSE.txt for more info.
+# -----------------------------------------------------------------------------
+"""
+Cached resolution of native libraries.
+
+`ctypes.util.find_library` spawns ``ldconfig -p`` (and possibly gcc) on
+Linux, which costs tens to hundreds of milliseconds on every import.
+`load_library` avoids it as much as possible by trying, in order:
+
+ - a path given by an environment variable,
+ - the well-known sonames of the library, opened directly,
+ - the name found by a previous process, cached on disk along with the
+   modification time of the dynamic linker cache (``/etc/ld.so.cache``) and
+   the library search path,
+
+and only then falls back to `ctypes.util.find_library`, caching its result.
+
+`find_library` follows the same steps to locate a library without loading
+it, looking for the sonames in the usual library directories.
+"""
+import os
+import sys
+import glob
+import ctypes
+import ctypes.util
+from . import cache
+
+
+def cache_path():
+    """ Path of the cache of resolved library names.
+
+    It is given by the APP_LIBRARY_CACHE environment variable, if set (an
+    empty value disables the cache), otherwise it is in the user cache
+    directory.
+    """
+
+    return cache.cache_path('APP_LIBRARY_CACHE', 'libraries.json')
+
+
+def _stamp():
+    """ What library resolution depends on """
+
+    try:
+        mtime = os.path.getmtime('/etc/ld.so.cache')
+    except OSError:
+        mtime = None
+    return [mtime, os.environ.get('LD_LIBRARY_PATH'),
+            os.environ.get('DYLD_LIBRARY_PATH')]
+
+
+def _load_cache():
+    return cache.load(cache_path(), _stamp())
+
+
+def _save_cache(libraries):
+    cache.save(cache_path(), _stamp(), libraries)
+
+
+def _library_dirs():
+    """ Directories the dynamic linker usually searches """
+
+    dirs = []
+    for variable in ('LD_LIBRARY_PATH', 'DYLD_LIBRARY_PATH'):
+        dirs.extend([d for d in os.environ.get(variable, '').split(os.pathsep)
+                       if d])
+    if sys.platform == 'darwin':
+        dirs.extend(['/usr/local/lib', '/opt/homebrew/lib', '/usr/lib'])
+    else:
+        dirs.extend(['/usr/local/lib', '/usr/lib', '/lib',
+                     '/usr/lib64', '/lib64'])
+        dirs.extend(sorted(glob.glob('/usr/lib/*-linux-gnu*')))
+        dirs.extend(sorted(glob.glob('/lib/*-linux-gnu*')))
+    return dirs
+
+
+def find_library(name, names=(), sonames=(), env=None):
+    """ Find a native library without loading it.
+
+    The arguments are those of `load_library`.
+
+    :rtype: str
+    :return: The path or name to load the library with, or None if it
+        cannot be found
+    """
+
+    if env is not None and env in os.environ:
+        path = os.environ[env]
+        if os.path.exists(path):
+            return os.path.realpath(path)
+
+    dirs = _library_dirs()
+    for soname in sonames:
+        for directory in dirs:
+            if os.path.exists(os.path.join(directory, soname)):
+                return soname
+
+    # Libraries not found are cached as well (as None), since they are
+    # looked for again whenever the dynamic linker cache changes
+    libraries = _load_cache()
+    if name in libraries:
+        return libraries[name]
+
+    path = None
+    for check in names or [name]:
+        path = ctypes.util.find_library(check)
+        if path is not None:
+            break
+    libraries[name] = path
+    _save_cache(libraries)
+    return path
+
+
+def load_library(name, names=(), sonames=(), env=None):
+    """ Find and load a native library.
+
+    :Parameters:
+
+        ``name``: str
+            Name of the library, used as key in the cache
+
+        ``names``: sequence
+            Names to give to `ctypes.util.find_library` (``name`` if empty)
+
+        ``sonames``: sequence
+            Well-known file names of the library, tried first
+
+        ``env``: str
+            Environment variable that may give the path of the library
+
+    :rtype: ctypes.CDLL
+    :raise OSError: if the library cannot be found
+    """
+
+    if env is not None and env in os.environ:
+        path = os.environ[env]
+        if os.path.exists(path):
+            return ctypes.CDLL(os.path.realpath(path))
+
+    for soname in sonames:
+        try:
+            return ctypes.CDLL(soname)
+        except OSError:
+            pass
+
+    libraries = _load_cache()
+    if name in libraries:
+        path = libraries[name]
+        if path is None:
+            raise OSError('%s library not found' % name)
+        try:
+            return ctypes.CDLL(path)
+        except OSError:
+            pass
+
+    for check in names or [name]:
+        path = ctypes.util.find_library(check)
+        if path is not None:
+            library = ctypes.CDLL(path)
+            libraries[name] = path
+            _save_cache(libraries)
+            return library
+    # Cached as not found, see find_library
+    libraries[name] = None
+    _save_cache(libraries)
+    raise OSError('%s library not found' % name)
@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2014, Vispy Development Team.
+# Distributed under the (new) BSD License. See LICENSE.txt for more info.
+# -----------------------------------------------------------------------------
+"""
+Recording and replay of input events.
+
+A `Recorder` hooks the ``dispatch_event`` method of windows and writes the
+events they receive to a compact binary log, which a `Replayer` later feeds
+back to windows of any backend, including the null one, so that an
+interactive session can be reproduced, e.g. for benchmarking::
+
+    recorder = Recorder(open('session.rec', 'wb'), [window])
+    recorder.start()
+    app.run(backend)
+    recorder.stop()
+
+    ...
+
+    window = backend_null.Window()
+    replayer = Replayer(open('session.rec', 'rb'), [window],
+                        callback=lambda: window.close())
+    replayer.start()
+    app.run(backend_null)
+
+Events are replayed either at their recorded time, scaled by a speed factor,
+or, when the speed is None, iteration by iteration of the main loop, as fast
+as the loop runs, which is deterministic: the events of each recorded
+iteration are replayed together on an iteration of their own, one iteration
+later than recorded so that events received before the first iteration
+(numbered 0) also get theirs.  Windows
+with a ``post_event`` method (see the null backend) get replayed events
+through their native event queue, others have them dispatched directly.
+
+Draw, idle and init events are not recorded.  Event buffering (see
+`Window.set_event_buffering`) must be set up before recording starts.
+A recording can be stopped and started again, times and iterations
+carrying on from the first start.
+
+The log starts with a magic string and is then a sequence of records, all
+little-endian.  A record starts with a byte giving its event type id, or 0
+for the definition of an event type:
+
+  - definition: the id (B), the length (B) and name of the event type,
+    and the length (B) and format of its arguments, in the `struct`
+    module notation with ``s`` standing for a string (a H length followed
+    by UTF-8 bytes);
+  - event: the window index (B), the main loop iteration (I) and the time
+    since the start of the recording (d), followed by the arguments packed
+    according to the format of the event type.
+"""
+import struct
+from . import clock
+from . import log
+
+# Magic string at the start of a log
+MAGIC = b'APPREC\x00\x01'
+
+# Events that are never recorded
+IGNORED = frozenset(['on_draw', 'on_idle', 'on_init'])
+
+_definition = struct.Struct('<BBB')
+_header = struct.Struct('<BBId')
+_length = struct.Struct('<H')
+_byte = struct.Struct('<B')
+
+try:
+    _string_types = (str, unicode)
+    _int_types = (int, long)
+except NameError:
+    _string_types = (str, bytes)
+    _int_types = (int,)
+
+
+def _code(value):
+    """ Format code of an argument, None if it cannot be recorded """
+
+    if isinstance(value, bool):
+        return '?'
+    elif isinstance(value, _int_types):
+        if -0x80000000 <= value < 0x80000000:
+            return 'i'
+        return 'q'
+    elif isinstance(value, float):
+        return 'd'
+    elif isinstance(value, _string_types):
+        return 's'
+    return None
+
+
+def _structs(fmt):
+    """ Split a format at strings into (struct, number of arguments) pairs,
+    a None struct standing for a string """
+
+    structs = []
+    for part in fmt.split('s'):
+        if part:
+            structs.append((struct.Struct('<' + part), len(part)))
+        structs.append((None, 1))
+    return structs[:-1]
+
+
+class Recorder(object):
+    """ Records the events of windows to a binary log """
+
+    def __init__(self, file, windows, buffer_size=65536, clock=None):
+        """ Create a recorder.
+
+        :Parameters:
+
+            ``file``: file
+                Binary file object the log is written to
+
+            ``windows``: list
+                Windows whose events are recorded
+
+            ``buffer_size``: int
+                Number of bytes buffered before writing to the file
+
+            ``clock``: Clock
+                Clock counting the iterations of the main loop and timing
+                the events (the default one if None)
+        """
+        self.file = file
+        self.windows = list(windows)
+        self.buffer_size = buffer_size
+        self.clock = clock
+        self.frame = 0
+        self.count = 0
+        self._buffer = bytearray()
+        self._types = {}
+        self._dispatchers = []
+        self._start = None
+        self._recording = False
+        self._skipped = set()
+
+    def start(self):
+        """ Start recording, writing the magic string on the first start. """
+
+        if self._recording:
+            return
+        if self.clock is None:
+            self.clock = clock.get_default()
+        if self._start is None:
+            self._buffer += MAGIC
+            # Times are relative to the first start, so that they keep
+            # increasing if recording is stopped and started again
+            self._start = self.clock.time()
+        self._recording = True
+        self.clock.schedule(self._on_tick)
+        for index, window in enumerate(self.windows):
+            hooked = 'dispatch_event' in window.__dict__
+            dispatch = window.dispatch_event
+            self._dispatchers.append((window, hooked, dispatch))
+            window.dispatch_event = self._hook(index, dispatch)
+
+    def stop(self):
+        """ Stop recording and flush the log. """
+
+        if not self._recording:
+            return
+        self.clock.unschedule(self._on_tick)
+        for window, hooked, dispatch in self._dispatchers:
+            if hooked:
+                window.dispatch_event = dispatch
+            else:
+                del window.dispatch_event
+        self._dispatchers = []
+        self._recording = False
+        self.flush()
+
+    def flush(self):
+        """ Write the buffered records to the file. """
+
+        if self._buffer:
+            self.file.write(bytes(self._buffer))
+            self._buffer = bytearray()
+        self.file.flush()
+
+    def _on_tick(self, dt):
+        self.frame += 1
+
+    def _hook(self, index, dispatch):
+        def dispatch_event(event_type, *args):
+            if event_type not in IGNORED:
+                self._record(index, event_type, args)
+            return dispatch(event_type, *args)
+        return dispatch_event
+
+    def _record(self, index, event_type, args):
+        codes = [_code(arg) for arg in args]
+        if None in codes:
+            if event_type not in self._skipped:
+                self._skipped.add(event_type)
+                log.warn('Cannot record %s events' % event_type)
+            return
+        fmt = ''.join(codes)
+        key = event_type, fmt
+        definition = self._types.get(key)
+        if definition is None:
+            definition = self._define(event_type, fmt)
+
+        type_id, structs = definition
+        buffer = self._buffer
+        buffer += _header.pack(type_id, index, self.frame,
+                               self.clock.time() - self._start)
+        if len(structs) == 1 and structs[0][0] is not None:
+            buffer += structs[0][0].pack(*args)
+        else:
+            i = 0
+            for part, n in structs:
+                if part is None:
+                    value = args[i]
+                    if not isinstance(value, bytes):
+                        value = value.encode('utf-8')
+                    buffer += _length.pack(len(value))
+                    buffer += value
+                else:
+                    buffer += part.pack(*args[i:i + n])
+                i += n
+        self.count += 1
+        if len(buffer) >= self.buffer_size:
+            self.flush()
+
+    def _define(self, event_type, fmt):
+        type_id = len(self._types) + 1
+        if type_id > 255:
+            raise ValueError('Too many event types to record')
+        name = event_type.encode('ascii')
+        self._buffer += _definition.pack(0, type_id, len(name))
+        self._buffer += name
+        self._buffer += _byte.pack(len(fmt))
+        self._buffer += fmt.encode('ascii')
+        definition = self._types[event_type, fmt] = type_id, _structs(fmt)
+        return definition
+
+
+def read(file):
+    """ Read a log.
+
+    :Parameters:
+
+        ``file``: file
+            Binary file object the log is read from
+
+    :rtype: list
+    :return: A list of ``(window index, frame, time, event type, args)``
+        tuples, in recorded order
+    """
+
+    data = file.read()
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError('Not an event log')
+    types = {}
+    events = []
+    offset = len(MAGIC)
+    size = len(data)
+    while offset < size:
+        type_id = _byte.unpack_from(data, offset)[0]
+        if type_id == 0:
+            type_id, length = _definition.unpack_from(data, offset)[1:]
+            offset += _definition.size
+            name = data[offset:offset + length].decode('ascii')
+            offset += length
+            length = _byte.unpack_from(data, offset)[0]
+            offset += 1
+            fmt = data[offset:offset + length].decode('ascii')
+            offset += length
+            types[type_id] = str(name), _structs(fmt)
+            continue
+
+        type_id, index, frame, time = _header.unpack_from(data, offset)
+        offset += _header.size
+        event_type, structs = types[type_id]
+        args = ()
+        for part, n in structs:
+            if part is None:
+                length = _length.unpack_from(data, offset)[0]
+                offset += _length.size
+                args += (data[offset:offset + length].decode('utf-8'),)
+                offset += length
+            else:
+                args += part.unpack_from(data, offset)
+                offset += part.size
+        events.append((index, frame, time, event_type, args))
+    return events
+
+
+class Replayer(object):
+    """ Replays a log of events to windows """
+
+    def __init__(self, file, windows, speed=1.0, callback=None, clock=None):
+        """ Create a replayer.
+
+        :Parameters:
+
+            ``file``: file
+                Binary file object the log is read from
+
+            ``windows``: list
+                Windows the events are replayed to, in the order of the
+                recorded ones
+
+            ``speed``: float
+                Replay speed relative to the recording, or None to replay
+                the events of each recorded iteration of the main loop on
+                an iteration of their own
+
+            ``callback``: callable
+                Function called without arguments once all events have been
+                replayed
+
+            ``clock``: Clock
+                Clock driving the replay (the default one if None)
+        """
+        self.events = read(file)
+        self.windows = list(windows)
+        self.speed = speed
+        self.callback = callback
+        self.clock = clock
+        self.position = 0
+        self.frame = 0
+        self.elapsed = 0.0
+
+    def start(self):
+        """ Start replaying on the next iterations of the main loop. """
+
+        if self.clock is None:
+            self.clock = clock.get_default()
+        self.clock.schedule(self._on_tick)
+
+    def stop(self):
+        """ Stop replaying. """
+
+        self.clock.unschedule(self._on_tick)
+
+    def _on_tick(self, dt):
+        self.frame += 1
+        self.elapsed += dt
+        events = self.events
+        windows = self.windows
+        position = self.position
+        if self.speed is None:
+            # Iteration 0 (before the first tick) is replayed on the first
+            # tick, and so on
+            frame = self.frame
+            while position < len(events) and events[position][1] < frame:
+                self._replay(windows, events[position])
+                position += 1
+        else:
+            time = self.elapsed * self.speed
+            while position < len(events) and events[position][2] <= time:
+                self._replay(windows, events[position])
+                position += 1
+        self.position = position
+        if position == len(events):
+            self.stop()
+            if self.callback is not None:
+                self.callback()
+
+    def _replay(self, windows, event):
+        index, frame, time, event_type, args = event
+        window = windows[index]
+        post_event = getattr(window, 'post_event', None)
+        if post_event is not None:
+            post_event(event_type, *args)
+        else:
+            window.dispatch_event(event_type, *args)
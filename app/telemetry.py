@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2014, Vispy Development Team.
+# Distributed under the (new) BSD License. See LICENSE.txt for more info.
+# -----------------------------------------------------------------------------
+"""
+Frame timing telemetry of the main loop.
+
+`Clock.get_fps` only tells how often the clock ticks.  When telemetry is
+enabled, each iteration of the main loop is broken down into phases, in
+seconds:
+
+    ``sleep``
+        Waiting for events or for the framerate limit
+    ``scheduler``
+        Running the scheduled functions of the clock
+    ``poll``
+        Polling and dispatching the backend events (everything the backend
+        does but drawing windows)
+    ``draw``, ``idle``, ``swap``
+        Dispatching on_draw and on_idle and swapping buffers, summed over
+        the windows redrawn during the iteration
+
+Frames are kept in a ring buffer of the most recent ones and can be
+exported as CSV or JSON lines, or handed to a callback as they are
+recorded::
+
+    from app import telemetry
+
+    telemetry.enable(size=600)
+    app.run(backend)
+    with open('frames.csv', 'w') as f:
+        telemetry.get_telemetry().write_csv(f)
+
+Each frame is a dict with the phases above, plus ``frame`` (number of the
+frame), ``time`` (start of the frame on the monotonic clock), ``total``
+(duration of the frame) and ``windows``, a list of the per window
+``draw``, ``idle`` and ``swap`` durations (identified by the window
+title).  CSV exports leave out the per window breakdown.
+"""
+import json
+import collections
+from . clock import _default_time_function
+
+# Telemetry of the main loop, if enabled
+_telemetry = None
+
+
+class Telemetry(object):
+    """ Ring buffer of the phase durations of main loop iterations """
+
+    #: Columns of CSV exports
+    fields = ('frame', 'time', 'sleep', 'scheduler', 'poll',
+              'draw', 'idle', 'swap', 'total')
+
+    def __init__(self, size=600, callback=None):
+        """ Create an empty buffer.
+
+        :Parameters:
+
+            ``size``: int
+                Number of most recent frames to keep
+
+            ``callback``: callable
+                Function called with each frame dict as it is recorded
+        """
+        self.frames = collections.deque(maxlen=max(int(size), 1))
+        self.callback = callback
+        self.count = 0
+        self._redraws = []
+        self._windows = self._clock = None
+
+    def clear(self):
+        """ Forget all frames """
+
+        self.frames.clear()
+
+    # ------------------------------------------------------------ hooks ---
+    # Called by the main loop step (see app._step) around its phases
+
+    def begin(self, backend, clock):
+        """ Start recording an iteration of the main loop.
+
+        The windows of the backend log their redraws until `end`, since the
+        backend calls their _redraw itself.
+        """
+
+        self._clock = clock
+        self._windows = list(backend.windows())
+        self._tick_start = self._process_start = None
+        del self._redraws[:]
+        for window in self._windows:
+            window._phase_log = self._redraws
+        self._start = _default_time_function()
+
+    def ticking(self):
+        """ The clock is about to be ticked. """
+
+        clock = self._clock
+        self._waited = clock._sleep_total + clock._busy_total
+        self._tick_start = _default_time_function()
+
+    def processing(self):
+        """ The backend is about to be processed. """
+
+        self._process_start = _default_time_function()
+        clock = self._clock
+        self._waited = clock._sleep_total + clock._busy_total - self._waited
+
+    def end(self, completed=True):
+        """ Stop recording the iteration and record its frame unless it did
+        not complete. """
+
+        end = _default_time_function()
+        for window in self._windows:
+            window._phase_log = None
+        self._windows = self._clock = None
+        redraws = self._redraws
+        if not completed:
+            del redraws[:]
+            return
+
+        draw = idle_time = swap = 0.0
+        windows = []
+        for window, d, i, s in redraws:
+            draw += d
+            idle_time += i
+            swap += s
+            windows.append({ 'window' : window._title,
+                             'draw'   : d,
+                             'idle'   : i,
+                             'swap'   : s })
+        del redraws[:]
+
+        start = self._start
+        tick_start = self._tick_start
+        process_start = self._process_start
+        waited = self._waited
+        self.count += 1
+        frame = { 'frame'     : self.count,
+                  'time'      : start,
+                  'sleep'     : tick_start - start + waited,
+                  'scheduler' : process_start - tick_start - waited,
+                  'poll'      : end - process_start - draw - idle_time - swap,
+                  'draw'      : draw,
+                  'idle'      : idle_time,
+                  'swap'      : swap,
+                  'total'     : end - start,
+                  'windows'   : windows }
+        self.frames.append(frame)
+        if self.callback is not None:
+            self.callback(frame)
+
+    def get_frames(self):
+        """ Get the recorded frames, oldest first.
+
+        :rtype: list
+        :return: A list of frame dicts
+        """
+
+        return list(self.frames)
+
+    def write_csv(self, file, header=True):
+        """ Write the recorded frames to a file object as CSV, one line per
+        frame with the `fields` columns. """
+
+        if header:
+            file.write(','.join(self.fields) + '\n')
+        fields = self.fields
+        for frame in self.frames:
+            file.write(','.join([repr(frame[name]) for name in fields]) + '\n')
+
+    def write_json(self, file):
+        """ Write the recorded frames to a file object as JSON lines, one
+        object per frame. """
+
+        for frame in self.frames:
+            file.write(json.dumps(frame) + '\n')
+
+
+def enable(size=600, callback=None):
+    """ Enable telemetry of the main loop and return it.
+
+    :Parameters:
+
+        ``size``: int
+            Number of most recent frames to keep
+
+        ``callback``: callable
+            Function called with each frame dict as it is recorded
+
+    :rtype: Telemetry
+    """
+
+    global _telemetry
+
+    _telemetry = Telemetry(size, callback)
+    return _telemetry
+
+
+def disable():
+    """ Disable telemetry of the main loop. """
+
+    global _telemetry
+
+    _telemetry = None
+
+
+def get_telemetry():
+    """ Get the telemetry of the main loop, None if it is disabled. """
+
+    return _telemetry
@@ -56,6 +56,11 @@ handler by setting the appropriate function on the instance::
     def on_resize(width, height):
         # ...
     dispatcher.on_resize = on_resize
+    dispatcher._invalidate_handlers()
+
+Handler chains are cached, so handlers set or deleted directly on the
+instance only take effect once `EventDispatcher._invalidate_handlers` has
+been called; the other methods described here take care of it.
 
 There is also a convenience decorator that reduces typing::
 
@@ -157,6 +162,13 @@ class EventDispatcher(object):
     # Placeholder empty stack; real stack is created only if needed
     _event_stack = ()
 
+    # Flattened handler chains per event type, built lazily on dispatch and
+    # discarded whenever the handler stack changes.
+    _handler_chains = None
+
+    # Registered event types, see register_event_type
+    _event_type_set = frozenset()
+
     @classmethod
     def register_event_type(cls, name):
         '''Register an event type with the dispatcher.
@@ -172,8 +184,39 @@ class EventDispatcher(object):
         if not hasattr(cls, 'event_types'):
             cls.event_types = []
         cls.event_types.append(name)
+        # Frozen copy for fast membership tests
+        cls._event_type_set = frozenset(cls.event_types)
         return name
 
+    def _invalidate_handlers(self):
+        '''Discard the cached handler chains.
+
+        Handler methods mutating the stack call this themselves; it must be
+        called explicitly after setting or deleting a handler directly on
+        the instance.
+        '''
+        self._handler_chains = None
+
+    def _get_handler_chain(self, event_type):
+        '''Return the handlers to call for an event type, in dispatch order.
+
+        Handlers are taken from the top of the stack downwards, followed by
+        the instance handler if there is one.  The result is cached until
+        the handlers change.
+        '''
+        chains = self._handler_chains
+        if chains is None:
+            chains = self._handler_chains = {}
+        chain = []
+        for frame in self._event_stack:
+            handler = frame.get(event_type, None)
+            if handler:
+                chain.append(handler)
+        if hasattr(self, event_type):
+            chain.append(getattr(self, event_type))
+        chain = chains[event_type] = tuple(chain)
+        return chain
+
     def push_handlers(self, *args, **kwargs):
         '''Push a level onto the top of the handler stack, then attach zero or
         more event handlers.
@@ -189,6 +232,7 @@ class EventDispatcher(object):
 
         # Place dict full of new handlers at beginning of stack
         self._event_stack.insert(0, {})
+        self._invalidate_handlers()
         self.set_handlers(*args, **kwargs)
 
     def _get_handlers(self, args, kwargs):
@@ -199,17 +243,17 @@ class EventDispatcher(object):
             if inspect.isroutine(object):
                 # Single magically named function
                 name = object.__name__
-                if name not in self.event_types:
+                if name not in self._event_type_set:
                     raise EventException('Unknown event "%s"' % name)
                 yield name, object
             else:
                 # Single instance with magically named methods
                 for name in dir(object):
-                    if name in self.event_types:
+                    if name in self._event_type_set:
                         yield name, getattr(object, name)
         for name, handler in kwargs.items():
             # Function for handling given event (no magic)
-            if name not in self.event_types:
+            if name not in self._event_type_set:
                 raise EventException('Unknown event "%s"' % name)
             yield name, handler
 
@@ -242,6 +286,7 @@ class EventDispatcher(object):
             self._event_stack = [{}]
 
         self._event_stack[0][name] = handler
+        self._invalidate_handlers()
 
     def pop_handlers(self):
         '''
@@ -250,6 +295,7 @@ class EventDispatcher(object):
         assert self._event_stack and 'No handlers pushed'
 
         del self._event_stack[0]
+        self._invalidate_handlers()
 
     def remove_handlers(self, *args, **kwargs):
         '''Remove event handlers from the event stack.
@@ -291,6 +337,7 @@ class EventDispatcher(object):
         # Remove the frame if it's empty.
         if not frame:
             self._event_stack.remove(frame)
+        self._invalidate_handlers()
 
     def remove_handler(self, name, handler):
         '''Remove a single event handler.
@@ -312,6 +359,7 @@ class EventDispatcher(object):
             try:
                 if frame[name] is handler:
                     del frame[name]
+                    self._invalidate_handlers()
                     break
             except KeyError:
                 pass
@@ -336,33 +384,23 @@ class EventDispatcher(object):
             True if an event handler returned True; False if one or more event
             handlers were invoked but returned only Fasle.
         '''
-        assert event_type in self.event_types
+        assert event_type in self._event_type_set
 
-        invoked = False
+        try:
+            handlers = self._handler_chains[event_type]
+        except (TypeError, KeyError):
+            handlers = self._get_handler_chain(event_type)
 
-        # Search handler stack for matching event handlers
-        for frame in list(self._event_stack):
-            handler = frame.get(event_type, None)
-            if handler:
-                try:
-                    invoked = True
-                    if handler(*args):
-                        return EVENT_HANDLED
-                except TypeError:
-                    self._raise_dispatch_exception(event_type, args, handler)
-
-
-        # Check instance for an event handler
-        if hasattr(self, event_type):
+        # The chain is an immutable snapshot, so handlers may modify the
+        # stack while the event is being dispatched.
+        for handler in handlers:
             try:
-                invoked = True
-                if getattr(self, event_type)(*args):
+                if handler(*args):
                     return EVENT_HANDLED
             except TypeError:
-                self._raise_dispatch_exception(
-                    event_type, args, getattr(self, event_type))
+                self._raise_dispatch_exception(event_type, args, handler)
 
-        if invoked:
+        if handlers:
             return EVENT_UNHANDLED
 
         return False
@@ -407,3 +407,300 @@ for _name, _value in locals().items():
             _motion_names[_value] = _name
         else:
             _key_names[_value] = _name
+
+
+# Key translation tables
+
+class KeyTable(object):
+    '''Translation of the key codes and modifier masks of a toolkit into
+    key symbols and modifier constants.
+
+    The mappings are compiled into flat lists the first time the table is
+    used: key codes below `size` are translated by indexing a list (larger
+    codes, such as Qt ones, fall back to a dict) and modifier masks by
+    indexing a list covering all the combinations of the mapped bits.
+    '''
+
+    def __init__(self, key_map, modifier_map=(), ranges=(), size=512):
+        '''Create a translation table.
+
+        :Parameters:
+            `key_map` : dict
+                Key symbols by toolkit key code.
+            `modifier_map` : sequence
+                Pairs of toolkit modifier mask and modifier constant.
+            `ranges` : sequence
+                Pairs of first and last toolkit key codes translated into
+                themselves (e.g. ASCII characters).
+            `size` : int
+                Number of key codes translated by list lookup.
+        '''
+        self.key_map = key_map
+        self.modifier_map = modifier_map
+        self.ranges = ranges
+        self.size = size
+        self._keys = None
+
+    def compile(self):
+        '''Build the lookup lists from the mappings.'''
+        keys = [UNKNOWN] * self.size
+        extra = {}
+        for first, last in self.ranges:
+            for code in range(first, last + 1):
+                keys[code] = code
+        for code, symbol in self.key_map.items():
+            if 0 <= code < self.size:
+                keys[code] = symbol
+            else:
+                extra[code] = symbol
+
+        # Index the modifier list by the span of bits covering all the
+        # mapped toolkit masks
+        bits = 0
+        for mask, modifier in self.modifier_map:
+            bits |= mask
+        shift = 0
+        while bits and not (bits >> shift) & 1:
+            shift += 1
+        span = len(bin(bits >> shift)) - 2 if bits else 0
+        modifiers = []
+        for index in range(1 << span):
+            mask = index << shift
+            value = 0
+            for toolkit_mask, modifier in self.modifier_map:
+                if mask & toolkit_mask:
+                    value |= modifier
+            modifiers.append(value)
+
+        self._extra = extra
+        self._shift = shift
+        self._span_mask = (1 << span) - 1
+        self._modifiers = modifiers
+        self._keys = keys
+
+    def translate_key(self, code):
+        '''Return the key symbol of a toolkit key code, `UNKNOWN` if it is
+        not mapped.'''
+        keys = self._keys
+        if keys is None:
+            self.compile()
+            keys = self._keys
+        if 0 <= code < self.size:
+            return keys[code]
+        return self._extra.get(code, UNKNOWN)
+
+    def translate_modifiers(self, mask):
+        '''Return the modifier constants of a toolkit modifier mask.'''
+        if self._keys is None:
+            self.compile()
+        return self._modifiers[(mask >> self._shift) & self._span_mask]
+
+
+# Printable ASCII characters, translated into themselves
+_ascii = [(0x020, 0x040), (0x05b, 0x07e)]
+
+def _glfw_table(glfw):
+    return KeyTable({ glfw.GLFW_KEY_ESCAPE:        ESCAPE,
+                      glfw.GLFW_KEY_ENTER:         ENTER,
+                      glfw.GLFW_KEY_TAB:           TAB,
+                      glfw.GLFW_KEY_BACKSPACE:     BACKSPACE,
+                      glfw.GLFW_KEY_INSERT:        INSERT,
+                      glfw.GLFW_KEY_DELETE:        DELETE,
+                      glfw.GLFW_KEY_RIGHT:         RIGHT,
+                      glfw.GLFW_KEY_LEFT:          LEFT,
+                      glfw.GLFW_KEY_DOWN:          DOWN,
+                      glfw.GLFW_KEY_UP:            UP,
+                      glfw.GLFW_KEY_PAGE_UP:       PAGEUP,
+                      glfw.GLFW_KEY_PAGE_DOWN:     PAGEDOWN,
+                      glfw.GLFW_KEY_HOME:          HOME,
+                      glfw.GLFW_KEY_END:           END,
+                      glfw.GLFW_KEY_CAPS_LOCK:     CAPSLOCK,
+                      glfw.GLFW_KEY_PRINT_SCREEN:  PRINT,
+                      glfw.GLFW_KEY_PAUSE:         PAUSE,
+                      glfw.GLFW_KEY_F1:            F1,
+                      glfw.GLFW_KEY_F2:            F2,
+                      glfw.GLFW_KEY_F3:            F3,
+                      glfw.GLFW_KEY_F4:            F4,
+                      glfw.GLFW_KEY_F5:            F5,
+                      glfw.GLFW_KEY_F6:            F6,
+                      glfw.GLFW_KEY_F7:            F7,
+                      glfw.GLFW_KEY_F8:            F8,
+                      glfw.GLFW_KEY_F9:            F9,
+                      glfw.GLFW_KEY_F10:           F10,
+                      glfw.GLFW_KEY_F11:           F11,
+                      glfw.GLFW_KEY_F12:           F12 },
+                    [ (glfw.GLFW_MOD_SHIFT,   MOD_SHIFT),
+                      (glfw.GLFW_MOD_CONTROL, MOD_CTRL),
+                      (glfw.GLFW_MOD_ALT,     MOD_ALT),
+                      (glfw.GLFW_MOD_SUPER,   MOD_COMMAND) ],
+                    [ (32, 96), (161, 162) ])
+
+def _glut_table(glut):
+    # Characters of glutKeyboardFunc
+    return KeyTable({ 0x008:                   BACKSPACE,
+                      0x009:                   TAB,
+                      0x00A:                   LINEFEED,
+                      0x00C:                   CLEAR,
+                      0x00D:                   RETURN,
+                      0x018:                   CANCEL,
+                      0x01B:                   ESCAPE },
+                    [ (glut.GLUT_ACTIVE_SHIFT, MOD_SHIFT),
+                      (glut.GLUT_ACTIVE_CTRL,  MOD_CTRL),
+                      (glut.GLUT_ACTIVE_ALT,   MOD_ALT) ],
+                    _ascii, 256)
+
+def _glut_special_table(glut):
+    # Keys of glutSpecialFunc
+    return KeyTable({ glut.GLUT_KEY_F1:        F1,
+                      glut.GLUT_KEY_F2:        F2,
+                      glut.GLUT_KEY_F3:        F3,
+                      glut.GLUT_KEY_F4:        F4,
+                      glut.GLUT_KEY_F5:        F5,
+                      glut.GLUT_KEY_F6:        F6,
+                      glut.GLUT_KEY_F7:        F7,
+                      glut.GLUT_KEY_F8:        F8,
+                      glut.GLUT_KEY_F9:        F9,
+                      glut.GLUT_KEY_F10:       F10,
+                      glut.GLUT_KEY_F11:       F11,
+                      glut.GLUT_KEY_F12:       F12,
+                      glut.GLUT_KEY_LEFT:      LEFT,
+                      glut.GLUT_KEY_UP:        UP,
+                      glut.GLUT_KEY_RIGHT:     RIGHT,
+                      glut.GLUT_KEY_DOWN:      DOWN,
+                      glut.GLUT_KEY_PAGE_UP:   PAGEUP,
+                      glut.GLUT_KEY_PAGE_DOWN: PAGEDOWN,
+                      glut.GLUT_KEY_HOME:      HOME,
+                      glut.GLUT_KEY_END:       END,
+                      glut.GLUT_KEY_INSERT:    INSERT },
+                    [ (glut.GLUT_ACTIVE_SHIFT, MOD_SHIFT),
+                      (glut.GLUT_ACTIVE_CTRL,  MOD_CTRL),
+                      (glut.GLUT_ACTIVE_ALT,   MOD_ALT) ],
+                    (), 256)
+
+def _pygame_table(pygame):
+    return KeyTable({ 0x008:              BACKSPACE,
+                      0x009:              TAB,
+                      0x00A:              LINEFEED,
+                      0x00C:              CLEAR,
+                      0x00D:              RETURN,
+                      0x018:              CANCEL,
+                      0x01B:              ESCAPE,
+                      pygame.K_F1:        F1,
+                      pygame.K_F2:        F2,
+                      pygame.K_F3:        F3,
+                      pygame.K_F4:        F4,
+                      pygame.K_F5:        F5,
+                      pygame.K_F6:        F6,
+                      pygame.K_F7:        F7,
+                      pygame.K_F8:        F8,
+                      pygame.K_F9:        F9,
+                      pygame.K_F10:       F10,
+                      pygame.K_F11:       F11,
+                      pygame.K_F12:       F12,
+                      pygame.K_LEFT:      LEFT,
+                      pygame.K_UP:        UP,
+                      pygame.K_RIGHT:     RIGHT,
+                      pygame.K_DOWN:      DOWN,
+                      pygame.K_PAGEUP:    PAGEUP,
+                      pygame.K_PAGEDOWN:  PAGEDOWN,
+                      pygame.K_HOME:      HOME,
+                      pygame.K_END:       END,
+                      pygame.K_INSERT:    INSERT },
+                    [ (pygame.KMOD_LSHIFT | pygame.KMOD_RSHIFT, MOD_SHIFT),
+                      (pygame.KMOD_LCTRL | pygame.KMOD_RCTRL,   MOD_CTRL),
+                      (pygame.KMOD_LALT | pygame.KMOD_RALT,     MOD_ALT) ],
+                    _ascii)
+
+def _sdl2_table(sdl2):
+    return KeyTable({ sdl2.SDLK_BACKSPACE: BACKSPACE,
+                      sdl2.SDLK_TAB:       TAB,
+                      sdl2.SDLK_RETURN:    RETURN,
+                      sdl2.SDLK_ESCAPE:    ESCAPE,
+                      sdl2.SDLK_DELETE:    DELETE,
+                      sdl2.SDLK_F1:        F1,
+                      sdl2.SDLK_F2:        F2,
+                      sdl2.SDLK_F3:        F3,
+                      sdl2.SDLK_F4:        F4,
+                      sdl2.SDLK_F5:        F5,
+                      sdl2.SDLK_F6:        F6,
+                      sdl2.SDLK_F7:        F7,
+                      sdl2.SDLK_F8:        F8,
+                      sdl2.SDLK_F9:        F9,
+                      sdl2.SDLK_F10:       F10,
+                      sdl2.SDLK_F11:       F11,
+                      sdl2.SDLK_F12:       F12,
+                      sdl2.SDLK_LEFT:      LEFT,
+                      sdl2.SDLK_UP:        UP,
+                      sdl2.SDLK_RIGHT:     RIGHT,
+                      sdl2.SDLK_DOWN:      DOWN,
+                      sdl2.SDLK_PAGEUP:    PAGEUP,
+                      sdl2.SDLK_PAGEDOWN:  PAGEDOWN,
+                      sdl2.SDLK_HOME:      HOME,
+                      sdl2.SDLK_END:       END,
+                      sdl2.SDLK_INSERT:    INSERT },
+                    [ (sdl2.KMOD_SHIFT, MOD_SHIFT),
+                      (sdl2.KMOD_CTRL,  MOD_CTRL),
+                      (sdl2.KMOD_ALT,   MOD_ALT),
+                      (sdl2.KMOD_GUI,   MOD_COMMAND) ],
+                    _ascii, 128)
+
+def _qt_table(QtCore):
+    return KeyTable({ QtCore.Qt.Key_Left:      LEFT,
+                      QtCore.Qt.Key_Up:        UP,
+                      QtCore.Qt.Key_Right:     RIGHT,
+                      QtCore.Qt.Key_Down:      DOWN,
+                      QtCore.Qt.Key_PageUp:    PAGEUP,
+                      QtCore.Qt.Key_PageDown:  PAGEDOWN,
+                      QtCore.Qt.Key_Insert:    INSERT,
+                      QtCore.Qt.Key_Delete:    DELETE,
+                      QtCore.Qt.Key_Home:      HOME,
+                      QtCore.Qt.Key_End:       END,
+                      QtCore.Qt.Key_Escape:    ESCAPE,
+                      QtCore.Qt.Key_Backspace: BACKSPACE,
+                      QtCore.Qt.Key_F1:        F1,
+                      QtCore.Qt.Key_F2:        F2,
+                      QtCore.Qt.Key_F3:        F3,
+                      QtCore.Qt.Key_F4:        F4,
+                      QtCore.Qt.Key_F5:        F5,
+                      QtCore.Qt.Key_F6:        F6,
+                      QtCore.Qt.Key_F7:        F7,
+                      QtCore.Qt.Key_F8:        F8,
+                      QtCore.Qt.Key_F9:        F9,
+                      QtCore.Qt.Key_F10:       F10,
+                      QtCore.Qt.Key_F11:       F11,
+                      QtCore.Qt.Key_F12:       F12,
+                      QtCore.Qt.Key_Space:     SPACE,
+                      QtCore.Qt.Key_Enter:     ENTER,
+                      QtCore.Qt.Key_Return:    ENTER,
+                      QtCore.Qt.Key_Tab:       TAB },
+                    [ (int(QtCore.Qt.ShiftModifier),   MOD_SHIFT),
+                      (int(QtCore.Qt.ControlModifier), MOD_CTRL),
+                      (int(QtCore.Qt.AltModifier),     MOD_ALT),
+                      (int(QtCore.Qt.MetaModifier),    MOD_COMMAND) ],
+                    [ (32, 96), (161, 162) ], 256)
+
+_table_builders = { 'glfw'         : _glfw_table,
+                    'glut'         : _glut_table,
+                    'glut-special' : _glut_special_table,
+                    'pygame'       : _pygame_table,
+                    'sdl2'         : _sdl2_table,
+                    'qt'           : _qt_table }
+_tables = {}
+
+def get_table(toolkit, module):
+    '''Return the (cached) translation table of a toolkit.
+
+    :Parameters:
+        `toolkit` : str
+            One of 'glfw', 'glut', 'glut-special', 'pygame', 'sdl2' or
+            'qt'.
+        `module` :
+            Module of the toolkit defining its key and modifier constants
+            (e.g. ``QtCore`` for 'qt').
+
+    :rtype: `KeyTable`
+    '''
+    table = _tables.get(toolkit)
+    if table is None:
+        table = _tables[toolkit] = _table_builders[toolkit](module)
+    return table
@@ -34,6 +34,37 @@ import key
 import event
 import mouse
 from .. import log
+from .. clock import FrameTimes, _default_time_function
+
+
+def coalesce_motion(previous, current):
+    '''Coalescing policy for motion events.
+
+    Two consecutive motion events are merged into one reporting the last
+    position and the summed displacement.  Any trailing arguments (the
+    buttons of a drag) must be identical for the events to be merged.
+
+    :Parameters:
+
+        ``previous``: tuple
+            Arguments of the queued event (x, y, dx, dy, ...)
+
+        ``current``: tuple
+            Arguments of the incoming event (x, y, dx, dy, ...)
+
+    :rtype: tuple or None
+    :return: Arguments of the merged event, or None if events cannot be merged
+    '''
+    if previous[4:] != current[4:]:
+        return None
+    return ((current[0], current[1],
+             previous[2] + current[2], previous[3] + current[3])
+            + tuple(current[4:]))
+
+
+def coalesce_last(previous, current):
+    '''Coalescing policy keeping only the most recent event.'''
+    return current
 
 
 class Window(event.EventDispatcher):
@@ -119,8 +150,46 @@ class Window(event.EventDispatcher):
       def on_idle(self):
           'The window is inactive.'
           pass
+
+    By default, windows are redrawn on every iteration of the main loop.
+    When the loop runs on demand (see `app.run`), a window is only redrawn
+    after it has been invalidated, either explicitly with `invalidate` or
+    because it was resized or shown, and the loop sleeps while no window
+    needs to be redrawn and no scheduled function is due.
+
+    A window can also be given its own frame rate with `set_framerate`, in
+    which case it is redrawn at most that many times per second whatever
+    the rate of the main loop, and the loop sleeps until the next window
+    is due if no other needs to be redrawn.
+
+    Events can also be buffered (see `set_event_buffering`): they are then
+    queued as the backend receives them and dispatched once per iteration of
+    the main loop, just before the window is redrawn.  Consecutive events of
+    the same type may be coalesced into a single one, which is the default
+    for mouse motion, mouse drag and resize events.
+
+    Buffer swaps are synchronized with the vertical retrace of the display
+    when the configuration asks for it (see `Configuration.vsync`).  The
+    swap then paces the frames of the window and the main loop does not
+    limit them further while the window is to be redrawn.  The time spent
+    in each swap is measured and available from `get_present_stats`.
     '''
 
+    #: Default coalescing policies for buffered events
+    coalescing = { 'on_mouse_motion' : coalesce_motion,
+                   'on_mouse_drag'   : coalesce_motion,
+                   'on_resize'       : coalesce_last }
+
+    # Events invalidating the window whatever their handlers return
+    _invalidating_events = frozenset(['on_resize', 'on_show'])
+
+    # Events that are never buffered; pending events are flushed first
+    _unbuffered_events = frozenset(['on_init', 'on_draw', 'on_idle',
+                                    'on_close'])
+
+    # Event queue, None when events are not buffered
+    _event_queue = None
+
     def __init__( self, width=256, height=256, title=None, visible=True,
                   decoration=True, fullscreen=False, config=None, context=None):
         ''' '''
@@ -138,6 +207,18 @@ class Window(event.EventDispatcher):
         self._clock = None
         self._timer_stack = []
         self._timer_date = []
+        self._on_demand = False
+        self._needs_redraw = True
+        self._framerate = 0
+        self._frame_due = True
+        self._frame_handle = None
+        self._event_queue = None
+        self._event_policy = {}
+        self._swap_interval = 0
+        self._present_times = FrameTimes(60)
+        # List the phase durations of redraws are appended to, set by
+        # telemetry during main loop iterations (see app.telemetry)
+        self._phase_log = None
 
 
     def show(self):
@@ -167,6 +248,198 @@ class Window(event.EventDispatcher):
     def get_position(self):
         log.warn('%s backend cannot get position' % __name__)
 
+    def swap(self):
+        log.warn('%s backend cannot swap buffers' % __name__)
+
+    def activate(self):
+        log.warn('%s backend cannot make window active' % __name__)
+
+    def invalidate(self):
+        '''Request the window to be redrawn on the next iteration of the
+        main loop.
+
+        This is only needed when the loop runs on demand; otherwise windows
+        are redrawn on every iteration anyway.
+        '''
+        self._needs_redraw = True
+
+    @property
+    def needs_redraw(self):
+        '''Whether the window is to be redrawn on the next iteration of the
+        main loop.'''
+        if self._framerate:
+            return self._frame_due and (self._needs_redraw or
+                                        not self._on_demand)
+        return self._needs_redraw or not self._on_demand
+
+    def set_framerate(self, framerate):
+        '''Set the frame rate of the window.
+
+        :Parameters:
+
+            ``framerate``: float
+                Maximum number of frames per second, or 0 to redraw the
+                window on every iteration of the main loop
+        '''
+        self._framerate = framerate
+        if self._frame_handle is not None:
+            self._frame_handle.cancel()
+            self._frame_handle = None
+        if framerate and self._clock is not None:
+            self._frame_handle = self._clock.schedule_interval(
+                self._on_frame, 1.0/framerate)
+        self._frame_due = True
+
+    def get_framerate(self):
+        '''Get the frame rate of the window, 0 if there is none.'''
+        return self._framerate
+
+    def get_vsync(self):
+        '''Get whether buffer swaps are synchronized with the vertical
+        retrace: False, True or "adaptive".
+
+        This is the synchronization actually in effect, which may differ
+        from the one asked for in the configuration if the backend does not
+        support it.
+        '''
+        if self._swap_interval < 0:
+            return "adaptive"
+        return bool(self._swap_interval)
+
+    def get_present_stats(self):
+        '''Get statistics about the time spent swapping the buffers of
+        recent frames.
+
+        With vertical sync, this is mostly the time waited for the retrace.
+
+        :rtype: dict
+        :return: The duration statistics described in
+            `clock.FrameTimes.get_stats`, in seconds, plus ``vsync`` as
+            returned by `get_vsync`.
+        '''
+        stats = self._present_times.get_stats()
+        stats['vsync'] = self.get_vsync()
+        return stats
+
+    def _on_frame(self, dt):
+        self._frame_due = True
+
+    def _start_timers(self, clock):
+        '''Schedule the timers and frame rate of the window on the clock.
+        Called when the main loop starts.'''
+        self._clock = clock
+        for i in range(len(self._timer_stack)):
+            handler, fps = self._timer_stack[i]
+            clock.schedule_interval(handler, 1.0/fps)
+        self.set_framerate(self._framerate)
+
+    def _stop_timers(self):
+        '''Unschedule the timers and frame rate of the window.  Called by
+        the backend when the window is closed.'''
+        if self._clock is None:
+            return
+        for i in range(len(self._timer_stack)):
+            handler, fps = self._timer_stack[i]
+            self._clock.unschedule(handler)
+        if self._frame_handle is not None:
+            self._frame_handle.cancel()
+            self._frame_handle = None
+
+    def _redraw(self, dt):
+        '''Draw the window and swap its buffers.  Called by the backend
+        when the window needs to be redrawn.'''
+
+        # Make window active
+        self.activate()
+
+        # Dispatch the main draw event, then the idle event, timing them
+        # only for telemetry
+        if self._phase_log is not None:
+            start = _default_time_function()
+            self.dispatch_event('on_draw')
+            draw_end = _default_time_function()
+            self.dispatch_event('on_idle', dt)
+            draw_time = draw_end - start
+            idle_time = _default_time_function() - draw_end
+        else:
+            self.dispatch_event('on_draw')
+            self.dispatch_event('on_idle', dt)
+
+        # Swap buffers
+        start = _default_time_function()
+        self.swap()
+        swap_time = _default_time_function() - start
+        self._present_times.add(swap_time)
+
+        if self._phase_log is not None:
+            self._phase_log.append((self, draw_time, idle_time, swap_time))
+
+        self._needs_redraw = False
+        self._frame_due = False
+
+    def dispatch_event(self, event_type, *args):
+        '''Dispatch a single event to the attached handlers, or queue it if
+        events are buffered.  The window is invalidated first if it was
+        resized or shown.'''
+        if event_type in self._invalidating_events:
+            self._needs_redraw = True
+        if self._event_queue is not None:
+            if event_type not in self._unbuffered_events:
+                return self._queue_event(event_type, args)
+            self.flush_events()
+        return super(Window, self).dispatch_event(event_type, *args)
+
+    def set_event_buffering(self, buffered=True, policy=None):
+        '''Buffer events until the next iteration of the main loop.
+
+        :Parameters:
+
+            ``buffered``: bool
+                Whether events are buffered.  When buffering is turned off,
+                pending events are dispatched immediately.
+
+            ``policy``: dict
+                Coalescing policies overriding the `coalescing` defaults.
+                Keys are event types, values are functions taking the
+                arguments of the queued and incoming events and returning
+                the arguments of the merged event or None if they cannot be
+                merged.  A None value disables coalescing for an event type.
+        '''
+        if buffered:
+            self._event_policy = dict(self.coalescing)
+            self._event_policy.update(policy or {})
+            if self._event_queue is None:
+                self._event_queue = []
+        elif self._event_queue is not None:
+            self.flush_events()
+            self._event_queue = None
+
+    def flush_events(self):
+        '''Dispatch all buffered events.  Called by the backend once events
+        have been polled.'''
+        queue = self._event_queue
+        if not queue:
+            return
+        # Events dispatched by the handlers are queued for the next flush
+        self._event_queue = []
+        dispatch = super(Window, self).dispatch_event
+        for event_type, args in queue:
+            dispatch(event_type, *args)
+
+    def _queue_event(self, event_type, args):
+        '''Queue an event, coalescing it with the previous one if possible.'''
+        assert event_type in self._event_type_set
+        queue = self._event_queue
+        if queue and queue[-1][0] == event_type:
+            coalesce = self._event_policy.get(event_type)
+            if coalesce is not None:
+                merged = coalesce(queue[-1][1], args)
+                if merged is not None:
+                    queue[-1] = (event_type, merged)
+                    return event.EVENT_UNHANDLED
+        queue.append((event_type, args))
+        return event.EVENT_UNHANDLED
+
     def timer( self, fps ):
         '''Function decorator for timed handlers.
 
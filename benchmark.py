@@ -0,0 +1,248 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2014, Vispy Development Team.
+# Distributed under the (new) BSD License. See LICENSE.txt for more info.
+# -----------------------------------------------------------------------------
+"""
+Benchmarks for the clock, event dispatch and main loop hot paths.
+
+Each benchmark is timed with timeit and reported as the best time per
+operation over several repeats.  Results can be saved as a JSON baseline
+and later runs compared against it::
+
+    python benchmark.py --save baseline.json
+    python benchmark.py --compare baseline.json
+
+When comparing, the script exits with a non-zero status if any benchmark
+is slower than its baseline by more than the given tolerance.
+
+A reference baseline is kept in benchmark-baseline.json, which --compare
+uses when no file is given.  Since it was measured on another machine,
+baselines also store the time of a plain Python loop, and are scaled by
+how much faster or slower that loop runs here before comparing.  Refresh
+the reference (python benchmark.py --save benchmark-baseline.json) when a
+change is expected to alter the performance of a hot path.
+"""
+import os
+import sys
+import json
+import timeit
+import random
+
+import app.clock as clock
+from app.window import event
+
+
+class FakeTime(object):
+    """ Time function advancing by a fixed step on each call to step() """
+
+    def __init__(self, step=1/60.0):
+        self.now = 0.0
+        self.step_size = step
+
+    def __call__(self):
+        return self.now
+
+    def step(self):
+        self.now += self.step_size
+
+
+def _callback(dt, *args, **kwargs):
+    pass
+
+
+# ---------------------------------------------------------------- clock ---
+def bench_tick(count, interval=None):
+    """ Clock.tick with count interval items (0.1 to 1 second, or all of
+    the given interval) """
+
+    def setup():
+        time = FakeTime()
+        c = clock.Clock(time_function=time)
+        rng = random.Random(0)
+        for i in range(count):
+            c.schedule_interval(_callback, interval or rng.uniform(0.1, 1.0))
+        def run():
+            time.step()
+            c.tick()
+        return run
+    return setup
+
+
+def bench_schedule_soft(count):
+    """ schedule_interval_soft placement with count items already there """
+
+    def setup():
+        time = FakeTime()
+        c = clock.Clock(time_function=time)
+        for i in range(count):
+            c.schedule_interval_soft(_callback, 0.5)
+        def run():
+            c.schedule_interval_soft(_callback, 0.5)
+        return run
+    return setup
+
+
+def bench_unschedule(count):
+    """ schedule_interval/unschedule churn with count items already there """
+
+    def setup():
+        time = FakeTime()
+        c = clock.Clock(time_function=time)
+        for i in range(count):
+            c.schedule_interval(_callback, 0.5)
+        def func(dt):
+            pass
+        def run():
+            c.schedule_interval(func, 0.5)
+            c.unschedule(func)
+        return run
+    return setup
+
+
+# ------------------------------------------------------------- dispatch ---
+def bench_dispatch(depth):
+    """ dispatch_event through depth stack frames, none handling it """
+
+    def setup():
+        class Dispatcher(event.EventDispatcher):
+            pass
+        Dispatcher.register_event_type('on_mouse_motion')
+        dispatcher = Dispatcher()
+        for i in range(depth):
+            dispatcher.push_handlers(on_mouse_motion=lambda x, y, dx, dy: None)
+        def run():
+            dispatcher.dispatch_event('on_mouse_motion', 1, 2, 3, 4)
+        return run
+    return setup
+
+
+# -------------------------------------------------------------- process ---
+def bench_process(events):
+    """ Null backend process() with events mouse motions per frame """
+
+    def setup():
+        from app.backends import backend_null as backend
+        for window in list(backend.windows()):
+            window.close()
+        window = backend.Window()
+        window.push_handlers(on_draw=lambda: None,
+                             on_idle=lambda dt: None,
+                             on_mouse_motion=lambda x, y, dx, dy: None)
+        motion = [('on_mouse_motion', (1, 1, 1, 1))] * events
+        window.set_event_source(lambda window, dt: motion)
+        def run():
+            backend.process(1/60.0)
+        return run
+    return setup
+
+
+# ---------------------------------------------------------- calibration ---
+def bench_calibration():
+    """ Plain Python loop, measuring the speed of the interpreter """
+
+    def setup():
+        def run():
+            total = 0
+            for i in range(100):
+                total += i
+            return total
+        return run
+    return setup
+
+
+benchmarks = [
+    ('tick-10',          bench_tick(10)),
+    ('tick-1000',        bench_tick(1000)),
+    ('tick-100000',      bench_tick(100000)),
+    ('tick-shared-1000', bench_tick(1000, 0.1)),
+    ('schedule-soft',    bench_schedule_soft(1000)),
+    ('unschedule',       bench_unschedule(1000)),
+    ('dispatch-1',       bench_dispatch(1)),
+    ('dispatch-32',      bench_dispatch(32)),
+    ('process-null',     bench_process(0)),
+    ('process-null-100', bench_process(100)),
+]
+
+
+def measure(setup, repeat, duration):
+    """ Return the best time per call of the function returned by setup """
+
+    best = None
+    for i in range(repeat):
+        run = setup()
+        # Calibrate the number of calls so that a repeat lasts duration
+        number = 1
+        while True:
+            elapsed = timeit.timeit(run, number=number)
+            if elapsed >= duration / 10.0 or number >= 1e6:
+                break
+            number *= 10
+        number = max(1, int(number * duration / max(elapsed, 1e-9)))
+        elapsed = timeit.timeit(run, number=number) / number
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+# Reference baseline, next to this script
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'benchmark-baseline.json')
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--save", "-s", metavar="FILE",
+                        help="Save results as a JSON baseline")
+    parser.add_argument("--compare", "-c", metavar="FILE", nargs="?",
+                        const=BASELINE,
+                        help="Compare results against a JSON baseline "
+                             "(benchmark-baseline.json by default)")
+    parser.add_argument("--tolerance", "-t", default=0.2, type=float,
+                        help="Allowed slowdown relative to the baseline")
+    parser.add_argument("--repeat", "-r", default=5, type=int,
+                        help="Number of repeats per benchmark")
+    parser.add_argument("--duration", "-d", default=0.2, type=float,
+                        help="Duration of a repeat in seconds")
+    parser.add_argument("names", nargs="*",
+                        help="Benchmarks to run (all by default)")
+    args = parser.parse_args()
+
+    baseline = {}
+    scale = 1.0
+    calibration = measure(bench_calibration(), args.repeat, args.duration)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        # Adjust the baseline to the speed of this machine
+        if 'calibration' in baseline:
+            scale = calibration / baseline['calibration']
+        baseline = baseline.get('benchmarks', baseline)
+        print('%-20s %12.3f us  (x%.2f baseline)'
+              % ('calibration', calibration * 1e6, scale))
+
+    results = {}
+    regressions = []
+    for name, setup in benchmarks:
+        if args.names and name not in args.names:
+            continue
+        results[name] = value = measure(setup, args.repeat, args.duration)
+        line = '%-20s %12.3f us' % (name, value * 1e6)
+        if name in baseline:
+            ratio = value / (baseline[name] * scale)
+            line += '  (%+.1f%%)' % ((ratio - 1) * 100)
+            if ratio > 1 + args.tolerance:
+                line += '  REGRESSION'
+                regressions.append(name)
+        print(line)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({ 'calibration' : calibration,
+                        'benchmarks'  : results }, f, indent=2, sort_keys=True,
+                      separators=(',', ': '))
+
+    if regressions:
+        sys.exit(1)
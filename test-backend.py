@@ -3,39 +3,9 @@
 # Copyright (c) 2014, Vispy Development Team.
 # Distributed under the (new) BSD License. See LICENSE.txt for more info.
 # -----------------------------------------------------------------------------
+import app
 import app.clock as clock
-
-__clock__   = None
-__windows__ = []
-
-
-def run(default_clock=None, framerate=0):
-    """ Run the main loop """
-    global __clock__
-
-    if default_clock is None:
-        __clock__ = clock.get_default()
-    else:
-        __clock__ = default_clock
-    __clock__.set_fps_limit(framerate)
-
-    # Initialize timers for all windows
-    for window in backend.windows():
-        window._clock = __clock__
-
-        # Start timers
-        for i in range(len(window._timer_stack)):
-            handler, interval = window._timer_stack[i]
-            __clock__.schedule_interval(handler, interval)
-
-        # Dispatch init event
-        window.dispatch_event('on_init')
-
-    # Run until no more window
-    count = len(backend.windows())
-    while count:
-        count = backend.process(__clock__.tick())
-
+from app import backends
 
 
 if __name__ == '__main__':
@@ -44,16 +14,29 @@ if __name__ == '__main__':
     import OpenGL.GL as gl
 
     parser = argparse.ArgumentParser()
-    parser.add_argument("--backend", "-b", default="glfw",
-                        choices=['glfw', 'pyglet', 'osxglut', 'sdl', 'sdl2', 'pyside'],
-                        help="Backend to use, one of ")
+    parser.add_argument("--backend", "-b", default=None,
+                        choices=backends.names(),
+                        help="Backend to use (first available one with a "
+                             "display by default)")
+    parser.add_argument("--list", "-l", action="store_true",
+                        help="List the available backends and exit")
     parser.add_argument("--framerate", "-f", default=60, type=int,
                         help="Framerate in frames/second")
+    parser.add_argument("--on-demand", "-d", action="store_true",
+                        help="Only redraw windows when needed")
     args = parser.parse_args()
 
-    name = "app.backends.backend_" + args.backend
-    __import__(name)
-    backend = sys.modules[name]
+    if args.list:
+        for name in backends.available():
+            print "%-8s %s" % (name, backends.probe(name)['version'] or '')
+        sys.exit(0)
+
+    if args.backend == 'null':
+        parser.error("null backend has no GL context to draw with")
+    try:
+        backend = backends.get(args.backend)
+    except RuntimeError as e:
+        parser.error(str(e))
 
 
     window = backend.Window()
@@ -69,7 +52,7 @@ if __name__ == '__main__':
 
     @window.timer(1.0)
     def timer(elapsed):
-        print "FPS:", __clock__.get_fps()
+        print "FPS:", clock.get_fps()
         print 'Timed event 1 (%.3f second(s) elapsed)' % elapsed
 
     @window.event
@@ -130,4 +113,4 @@ if __name__ == '__main__':
         def on_mouse_motion(x, y, dx, dy):
             print 'Mouse motion (x=%.1f, y=%.1f, dx=%.1f, dy=%.1f)' % (x,y,dx,dy)
 
-    run(framerate=args.framerate)
+    app.run(backend, framerate=args.framerate, on_demand=args.on_demand)
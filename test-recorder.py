@@ -0,0 +1,107 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2014, Vispy Development Team.
+# Distributed under the (new) BSD License. See LICENSE.txt for more info.
+# -----------------------------------------------------------------------------
+"""
+Record a scripted session on the null backend, replay it iteration by
+iteration onto fresh windows and check that they receive the same events,
+each recorded iteration being replayed one iteration later.  Exits with a
+non-zero status on failure.
+"""
+import io
+import sys
+import app
+from app import recorder
+from app.backends import backend_null
+
+
+class Log(object):
+    """ Events received by windows, along with the main loop iteration """
+
+    event_types = ('on_mouse_motion', 'on_mouse_scroll', 'on_key_press',
+                   'on_character', 'on_resize')
+
+    def __init__(self, windows):
+        self.events = []
+        self.frame = 0
+        app.clock.schedule(self.on_tick)
+        for index, window in enumerate(windows):
+            for event_type in self.event_types:
+                window.set_handler(event_type,
+                                   self.handler(index, event_type))
+
+    def on_tick(self, dt):
+        self.frame += 1
+
+    def handler(self, index, event_type):
+        def handler(*args):
+            self.events.append((self.frame, index, event_type, args))
+        return handler
+
+    def close(self):
+        app.clock.unschedule(self.on_tick)
+
+
+if __name__ == '__main__':
+
+    # Events generated by the windows, by iteration
+    script = { 1 : [('on_mouse_motion', (1, 2, 3, 4)),
+                    ('on_character', (u'\xe9',)),
+                    ('on_key_press', (1 << 40, 3))],
+               2 : [('on_mouse_scroll', (10.5, 10, 0, 1))],
+               4 : [('on_mouse_motion', (1.5, 2.5, 0.5, 0.5))],
+               6 : [('on_close', ())] }
+    iteration = [0]
+    def source(window, dt):
+        iteration[0] += 1
+        return script.get(iteration[0], [])
+    def close(window, dt):
+        if iteration[0] >= 6:
+            return [('on_close', ())]
+        return []
+
+    # Record, with events before the first iteration and a restart
+    windows = [backend_null.Window(), backend_null.Window()]
+    recorded = Log(windows)
+    log = io.BytesIO()
+    rec = recorder.Recorder(log, windows)
+    rec.start()
+    windows[1].dispatch_event('on_resize', 320, 200)
+    rec.stop()
+    rec.start()
+    windows[0].set_event_source(source)
+    windows[1].set_event_source(close)
+    app.run(backend_null)
+    rec.stop()
+    recorded.close()
+
+    # Replay
+    log.seek(0)
+    times = [event[2] for event in recorder.read(log)]
+    log.seek(0)
+    windows = [backend_null.Window(), backend_null.Window()]
+    replayed = Log(windows)
+    done = []
+    replayer = recorder.Replayer(log, windows, speed=None,
+                                 callback=lambda: done.append(True))
+    replayer.start()
+    app.run(backend_null)
+    replayed.close()
+
+    failures = []
+    if times != sorted(times):
+        failures.append('recorded times go backwards: %r' % times)
+    if not done:
+        failures.append('replay did not complete')
+    expected = [(frame + 1, index, event_type, args)
+                for frame, index, event_type, args in recorded.events]
+    if replayed.events != expected:
+        failures.append('replayed events differ:\n  %r\n  %r'
+                        % (expected, replayed.events))
+
+    for failure in failures:
+        print 'FAIL:', failure
+    if failures:
+        sys.exit(1)
+    print 'OK: %d events recorded and replayed' % len(times)